@@ -12,6 +12,14 @@
  *   CMD_SFR_READ (0x03):  Send sfr_addr -> receive 2 bytes: <value> <~value>
  *   CMD_SFR_WRITE (0x04): Send sfr_addr, value -> receive 2 bytes: 0x00 0xFF
  *   CMD_INT_ACK (0x05):   Send int_mask -> receive 2 bytes: 0x00 0xFF (ACK ISR complete)
+ *   CMD_READ_BLOCK (0x06):  Send addr_hi, addr_lo, count -> receive count x 2 bytes: <value> <~value>
+ *   CMD_WRITE_BLOCK (0x07): Send addr_hi, addr_lo, count, count x value -> receive 2 bytes: 0x00 0xFF
+ *   CMD_ECHO_BLOCK (0x08):  Send count, count x value -> receive count x 2 bytes: <value> <~value>
+ *
+ * Block commands move 1-255 bytes in one round-trip. There is no UART flow
+ * control, so the host keeps every packet it sends (header + data) within
+ * the RX FIFO (16 bytes); CMD_READ_BLOCK replies are paced by uart_putc().
+ * Block commands have not yet been verified on real hardware.
  *
  * Interrupt signaling:
  *   After each command response, if any NEW interrupts fired, proxy sends:
@@ -41,6 +49,9 @@ typedef unsigned int uint16_t;
 #define CMD_SFR_READ    0x03
 #define CMD_SFR_WRITE   0x04
 #define CMD_INT_ACK     0x05
+#define CMD_READ_BLOCK  0x06
+#define CMD_WRITE_BLOCK 0x07
+#define CMD_ECHO_BLOCK  0x08
 
 /* Interrupt signal - 0x7E followed by int_mask (0x00-0x3F)
  * This can never be confused with a valid response since ~0x7E = 0x81,
@@ -174,7 +185,7 @@ void timer2_isr(void) __interrupt(5) { pending_int_mask |= (1 << 5); }
 
 void main(void)
 {
-    uint8_t cmd, val, addr_hi, addr_lo, mask;
+    uint8_t cmd, val, addr_hi, addr_lo, mask, count;
     uint16_t addr;
 
     // global init doesn't work, need to do it here
@@ -230,6 +241,35 @@ void main(void)
             send_ack();
             break;
 
+        case CMD_READ_BLOCK:
+            addr_hi = uart_getc();
+            addr_lo = uart_getc();
+            count = uart_getc();
+            addr = ((uint16_t)addr_hi << 8) | addr_lo;
+            while (count--) {
+                send_response(xdata_read(addr));
+                addr++;
+            }
+            break;
+
+        case CMD_WRITE_BLOCK:
+            addr_hi = uart_getc();
+            addr_lo = uart_getc();
+            count = uart_getc();
+            addr = ((uint16_t)addr_hi << 8) | addr_lo;
+            while (count--) {
+                xdata_write(addr, uart_getc());
+                addr++;
+            }
+            send_ack();
+            break;
+
+        case CMD_ECHO_BLOCK:
+            count = uart_getc();
+            while (count--)
+                send_response(uart_getc());
+            break;
+
         case CMD_SFR_READ:
             addr_lo = uart_getc();
             val = sfr_read(addr_lo);
@@ -5,6 +5,7 @@ This module implements the Intel 8051 instruction set with extensions
 for the ASM2464PD including code banking via DPX register.
 """
 
+import operator
 from typing import Callable, Optional
 from dataclasses import dataclass, field
 
@@ -20,6 +21,24 @@ INST_CYCLES = {
     'XCHD': 1, 'MOVX': 2,
 }
 
+# Offsets of the core registers in the SFR backing store (address - 0x80).
+# The opcode handlers read and write these directly instead of going
+# through read_sfr/write_sfr; none of them are ever hooked.
+IDX_SP = 0x81 - 0x80
+IDX_DPL = 0x82 - 0x80
+IDX_DPH = 0x83 - 0x80
+IDX_DPX = 0x96 - 0x80
+IDX_PSW = 0xD0 - 0x80
+IDX_ACC = 0xE0 - 0x80
+IDX_B = 0xF0 - 0x80
+
+# ALU operation for ORL/ANL/XRL keyed by opcode row (0x4x, 0x5x, 0x6x)
+LOGIC_OPS = {
+    0x40: operator.or_,
+    0x50: operator.and_,
+    0x60: operator.xor,
+}
+
 
 @dataclass
 class CPU8051:
@@ -36,6 +55,14 @@ class CPU8051:
     read_bit: Callable[[int], bool] = None
     write_bit: Callable[[int, bool], None] = None
 
+    # SFR backing store (0x80-0xFF), shared with Memory
+    sfr: bytearray = None
+
+    # CODE backing store, shared with Memory. Instruction fetches index it
+    # directly unless they hit the bank 1 window (>= 0x8000 with DPX bit 0
+    # set), which still goes through read_code for the file offset mapping.
+    code: bytearray = None
+
     # Registers - accessible via SFR space
     # PC is not in SFR space
     pc: int = 0
@@ -60,6 +87,9 @@ class CPU8051:
     # Proxy mode - when True, skip interrupt checking (hardware handles it)
     proxy_mode: bool = False
 
+    # Opcode dispatch table - 256 handler closures, built in __post_init__
+    _dispatch: tuple = field(default=(), init=False, repr=False)
+
     # SFR addresses
     SFR_ACC = 0xE0
     SFR_B = 0xF0
@@ -94,6 +124,10 @@ class CPU8051:
     PSW_AC = 6
     PSW_CY = 7
 
+    def __post_init__(self):
+        # Decode every opcode once up front so step() is a single indexed call
+        self._dispatch = tuple(self._build_handler(op) for op in range(256))
+
     # Property accessors for common registers
     @property
     def A(self) -> int:
@@ -184,33 +218,43 @@ class CPU8051:
 
     def get_reg(self, n: int) -> int:
         """Get R0-R7 from current register bank."""
-        bank = self.get_regbank()
-        addr = (bank * 8) + n
-        return self.read_idata(addr)
+        # RS1:RS0 are PSW bits 4:3, so PSW & 0x18 is already bank * 8
+        return self.read_idata((self.sfr[IDX_PSW] & 0x18) + n)
 
     def set_reg(self, n: int, value: int):
         """Set R0-R7 in current register bank."""
-        bank = self.get_regbank()
-        addr = (bank * 8) + n
-        self.write_idata(addr, value & 0xFF)
+        self.write_idata((self.sfr[IDX_PSW] & 0x18) + n, value & 0xFF)
 
     def push(self, value: int):
         """Push byte onto stack."""
-        sp = self.SP + 1
-        self.SP = sp
+        sfr = self.sfr
+        sp = (sfr[IDX_SP] + 1) & 0xFF
+        sfr[IDX_SP] = sp
         self.write_idata(sp, value & 0xFF)
 
     def pop(self) -> int:
         """Pop byte from stack."""
-        sp = self.SP
+        sfr = self.sfr
+        sp = sfr[IDX_SP]
         value = self.read_idata(sp)
-        self.SP = sp - 1
+        sfr[IDX_SP] = (sp - 1) & 0xFF
         return value
 
+    def _set_cy(self, value):
+        """Set or clear the carry flag directly in PSW."""
+        if value:
+            self.sfr[IDX_PSW] |= 0x80
+        else:
+            self.sfr[IDX_PSW] &= 0x7F
+
     def fetch(self) -> int:
         """Fetch next instruction byte and increment PC."""
-        byte = self.read_code(self.pc)
-        self.pc = (self.pc + 1) & 0xFFFF
+        pc = self.pc
+        if pc < 0x8000 or not self.sfr[IDX_DPX] & 1:
+            byte = self.code[pc]
+        else:
+            byte = self.read_code(pc)
+        self.pc = (pc + 1) & 0xFFFF
         return byte
 
     def fetch16(self) -> int:
@@ -316,8 +360,14 @@ class CPU8051:
             self.halted = True
             return 0
 
-        opcode = self.fetch()
-        cycles = self.execute(opcode)
+        # Fetch and dispatch directly through the opcode handler table
+        pc = self.pc
+        if pc < 0x8000 or not self.sfr[IDX_DPX] & 1:
+            opcode = self.code[pc]
+        else:
+            opcode = self.read_code(pc)
+        self.pc = (pc + 1) & 0xFFFF
+        cycles = self._dispatch[opcode]()
         self.cycles += cycles
 
         # Check for interrupts after executing instruction (so hardware can set flags)
@@ -328,877 +378,899 @@ class CPU8051:
 
     def execute(self, opcode: int) -> int:
         """Execute instruction by opcode. Returns cycles consumed."""
+        return self._dispatch[opcode]()
 
-        # Decode and execute based on opcode
-        # This is a large switch-like implementation
-
-        if opcode == 0x00:  # NOP
-            return 1
+    def _build_handler(self, op: int) -> Callable[[], int]:
+        """
+        Build the handler closure for a single opcode.
 
-        # AJMP addr11 - 5 variants (0x01, 0x21, 0x41, 0x61, 0x81, 0xA1, 0xC1, 0xE1)
-        elif opcode & 0x1F == 0x01:
-            addr11 = ((opcode & 0xE0) << 3) | self.fetch()
-            self.pc = (self.pc & 0xF800) | addr11
-            return 2
+        Called once per opcode at construction time. Anything that only
+        depends on the opcode (register number, AJMP page bits, ALU op)
+        is resolved here so the handler itself does no decoding.
+        Each handler executes the instruction and returns cycles consumed.
+        """
+        fetch = self.fetch
+        fetch16 = self.fetch16
+        rel_jump = self.rel_jump
+        get_direct = self.get_direct
+        set_direct = self.set_direct
+        get_reg = self.get_reg
+        set_reg = self.set_reg
+        read_idata = self.read_idata
+        write_idata = self.write_idata
+        read_xdata = self.read_xdata
+        write_xdata = self.write_xdata
+        read_sfr = self.read_sfr
+        read_bit = self.read_bit
+        write_bit = self.write_bit
+        push = self.push
+        pop = self.pop
+        add = self._add
+        subb = self._subb
+        set_cy = self._set_cy
+        sfr = self.sfr
+
+        # Register number for R0-R7 and @R0/@R1 forms
+        n = op & 0x07
+        ri = op & 0x01
+
+        # NOP
+        if op == 0x00:
+            def nop():
+                return 1
+            return nop
+
+        # AJMP addr11 - 8 variants (0x01, 0x21, 0x41, 0x61, 0x81, 0xA1, 0xC1, 0xE1)
+        if op & 0x1F == 0x01:
+            page = (op & 0xE0) << 3
+
+            def ajmp():
+                addr11 = page | fetch()
+                self.pc = (self.pc & 0xF800) | addr11
+                return 2
+            return ajmp
+
+        # ACALL addr11 - 8 variants
+        if op & 0x1F == 0x11:
+            page = (op & 0xE0) << 3
+
+            def acall():
+                addr11 = page | fetch()
+                push(self.pc & 0xFF)
+                push((self.pc >> 8) & 0xFF)
+                self.pc = (self.pc & 0xF800) | addr11
+                return 2
+            return acall
 
         # LJMP addr16
-        elif opcode == 0x02:
-            self.pc = self.fetch16()
-            return 2
+        if op == 0x02:
+            def ljmp():
+                self.pc = fetch16()
+                return 2
+            return ljmp
 
         # RR A
-        elif opcode == 0x03:
-            a = self.A
-            self.A = ((a >> 1) | (a << 7)) & 0xFF
-            return 1
+        if op == 0x03:
+            def rr_a():
+                a = sfr[IDX_ACC]
+                sfr[IDX_ACC] = ((a >> 1) | (a << 7)) & 0xFF
+                return 1
+            return rr_a
 
         # INC A
-        elif opcode == 0x04:
-            self.A = (self.A + 1) & 0xFF
-            return 1
+        if op == 0x04:
+            def inc_a():
+                sfr[IDX_ACC] = (sfr[IDX_ACC] + 1) & 0xFF
+                return 1
+            return inc_a
 
         # INC direct
-        elif opcode == 0x05:
-            addr = self.fetch()
-            self.set_direct(addr, (self.get_direct(addr) + 1) & 0xFF)
-            return 1
-
-        # INC @R0
-        elif opcode == 0x06:
-            addr = self.get_reg(0)
-            self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
-            return 1
-
-        # INC @R1
-        elif opcode == 0x07:
-            addr = self.get_reg(1)
-            self.write_idata(addr, (self.read_idata(addr) + 1) & 0xFF)
-            return 1
+        if op == 0x05:
+            def inc_direct():
+                addr = fetch()
+                set_direct(addr, (get_direct(addr) + 1) & 0xFF)
+                return 1
+            return inc_direct
+
+        # INC @R0 / @R1
+        if op in (0x06, 0x07):
+            def inc_indirect():
+                addr = get_reg(ri)
+                write_idata(addr, (read_idata(addr) + 1) & 0xFF)
+                return 1
+            return inc_indirect
 
         # INC R0-R7
-        elif 0x08 <= opcode <= 0x0F:
-            n = opcode & 0x07
-            self.set_reg(n, (self.get_reg(n) + 1) & 0xFF)
-            return 1
+        if 0x08 <= op <= 0x0F:
+            def inc_reg():
+                set_reg(n, (get_reg(n) + 1) & 0xFF)
+                return 1
+            return inc_reg
 
         # JBC bit, rel
-        elif opcode == 0x10:
-            bit = self.fetch()
-            rel = self.fetch()
-            if self.read_bit(bit):
-                self.write_bit(bit, False)
-                self.rel_jump(rel)
-            return 2
-
-        # ACALL addr11 - 5 variants
-        elif opcode & 0x1F == 0x11:
-            addr11 = ((opcode & 0xE0) << 3) | self.fetch()
-            self.push(self.pc & 0xFF)
-            self.push((self.pc >> 8) & 0xFF)
-            self.pc = (self.pc & 0xF800) | addr11
-            return 2
+        if op == 0x10:
+            def jbc():
+                bit = fetch()
+                rel = fetch()
+                if read_bit(bit):
+                    write_bit(bit, False)
+                    rel_jump(rel)
+                return 2
+            return jbc
 
         # LCALL addr16
-        elif opcode == 0x12:
-            addr = self.fetch16()
-            self.push(self.pc & 0xFF)
-            self.push((self.pc >> 8) & 0xFF)
-            self.pc = addr
-            return 2
+        if op == 0x12:
+            def lcall():
+                addr = fetch16()
+                push(self.pc & 0xFF)
+                push((self.pc >> 8) & 0xFF)
+                self.pc = addr
+                return 2
+            return lcall
 
         # RRC A
-        elif opcode == 0x13:
-            a = self.A
-            c = 1 if self.CY else 0
-            self.CY = bool(a & 1)
-            self.A = (c << 7) | (a >> 1)
-            return 1
+        if op == 0x13:
+            def rrc_a():
+                a = sfr[IDX_ACC]
+                c = 1 if sfr[IDX_PSW] & 0x80 else 0
+                set_cy(a & 1)
+                sfr[IDX_ACC] = (c << 7) | (a >> 1)
+                return 1
+            return rrc_a
 
         # DEC A
-        elif opcode == 0x14:
-            self.A = (self.A - 1) & 0xFF
-            return 1
+        if op == 0x14:
+            def dec_a():
+                sfr[IDX_ACC] = (sfr[IDX_ACC] - 1) & 0xFF
+                return 1
+            return dec_a
 
         # DEC direct
-        elif opcode == 0x15:
-            addr = self.fetch()
-            self.set_direct(addr, (self.get_direct(addr) - 1) & 0xFF)
-            return 1
-
-        # DEC @R0
-        elif opcode == 0x16:
-            addr = self.get_reg(0)
-            self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
-            return 1
-
-        # DEC @R1
-        elif opcode == 0x17:
-            addr = self.get_reg(1)
-            self.write_idata(addr, (self.read_idata(addr) - 1) & 0xFF)
-            return 1
+        if op == 0x15:
+            def dec_direct():
+                addr = fetch()
+                set_direct(addr, (get_direct(addr) - 1) & 0xFF)
+                return 1
+            return dec_direct
+
+        # DEC @R0 / @R1
+        if op in (0x16, 0x17):
+            def dec_indirect():
+                addr = get_reg(ri)
+                write_idata(addr, (read_idata(addr) - 1) & 0xFF)
+                return 1
+            return dec_indirect
 
         # DEC R0-R7
-        elif 0x18 <= opcode <= 0x1F:
-            n = opcode & 0x07
-            self.set_reg(n, (self.get_reg(n) - 1) & 0xFF)
-            return 1
+        if 0x18 <= op <= 0x1F:
+            def dec_reg():
+                set_reg(n, (get_reg(n) - 1) & 0xFF)
+                return 1
+            return dec_reg
 
         # JB bit, rel
-        elif opcode == 0x20:
-            bit = self.fetch()
-            rel = self.fetch()
-            if self.read_bit(bit):
-                self.rel_jump(rel)
-            return 2
+        if op == 0x20:
+            def jb():
+                bit = fetch()
+                rel = fetch()
+                if read_bit(bit):
+                    rel_jump(rel)
+                return 2
+            return jb
 
         # RET
-        elif opcode == 0x22:
-            hi = self.pop()
-            lo = self.pop()
-            self.pc = (hi << 8) | lo
-            return 2
+        if op == 0x22:
+            def ret():
+                hi = pop()
+                lo = pop()
+                self.pc = (hi << 8) | lo
+                return 2
+            return ret
 
         # RL A
-        elif opcode == 0x23:
-            a = self.A
-            self.A = ((a << 1) | (a >> 7)) & 0xFF
-            return 1
-
-        # ADD A, #imm
-        elif opcode == 0x24:
-            imm = self.fetch()
-            self._add(imm, False)
-            return 1
-
-        # ADD A, direct
-        elif opcode == 0x25:
-            addr = self.fetch()
-            self._add(self.get_direct(addr), False)
-            return 1
-
-        # ADD A, @R0
-        elif opcode == 0x26:
-            self._add(self.read_idata(self.get_reg(0)), False)
-            return 1
-
-        # ADD A, @R1
-        elif opcode == 0x27:
-            self._add(self.read_idata(self.get_reg(1)), False)
-            return 1
-
-        # ADD A, R0-R7
-        elif 0x28 <= opcode <= 0x2F:
-            self._add(self.get_reg(opcode & 0x07), False)
-            return 1
+        if op == 0x23:
+            def rl_a():
+                a = sfr[IDX_ACC]
+                sfr[IDX_ACC] = ((a << 1) | (a >> 7)) & 0xFF
+                return 1
+            return rl_a
+
+        # ADD / ADDC A, <src> (0x24-0x2F, 0x34-0x3F)
+        if 0x24 <= op <= 0x2F or 0x34 <= op <= 0x3F:
+            with_carry = op >= 0x34
+            low = op & 0x0F
+
+            if low == 0x04:  # #imm
+                def add_imm():
+                    add(fetch(), with_carry)
+                    return 1
+                return add_imm
+            if low == 0x05:  # direct
+                def add_direct():
+                    add(get_direct(fetch()), with_carry)
+                    return 1
+                return add_direct
+            if low in (0x06, 0x07):  # @R0 / @R1
+                def add_indirect():
+                    add(read_idata(get_reg(ri)), with_carry)
+                    return 1
+                return add_indirect
+
+            def add_reg():  # R0-R7
+                add(get_reg(n), with_carry)
+                return 1
+            return add_reg
 
         # JNB bit, rel
-        elif opcode == 0x30:
-            bit = self.fetch()
-            rel = self.fetch()
-            if not self.read_bit(bit):
-                self.rel_jump(rel)
-            return 2
+        if op == 0x30:
+            def jnb():
+                bit = fetch()
+                rel = fetch()
+                if not read_bit(bit):
+                    rel_jump(rel)
+                return 2
+            return jnb
 
         # RETI
-        elif opcode == 0x32:
-            hi = self.pop()
-            lo = self.pop()
-            self.pc = (hi << 8) | lo
-            self.in_interrupt = False
-            return 2
+        if op == 0x32:
+            def reti():
+                hi = pop()
+                lo = pop()
+                self.pc = (hi << 8) | lo
+                self.in_interrupt = False
+                return 2
+            return reti
 
         # RLC A
-        elif opcode == 0x33:
-            a = self.A
-            c = 1 if self.CY else 0
-            self.CY = bool(a & 0x80)
-            self.A = ((a << 1) | c) & 0xFF
-            return 1
-
-        # ADDC A, #imm
-        elif opcode == 0x34:
-            imm = self.fetch()
-            self._add(imm, True)
-            return 1
-
-        # ADDC A, direct
-        elif opcode == 0x35:
-            addr = self.fetch()
-            self._add(self.get_direct(addr), True)
-            return 1
-
-        # ADDC A, @R0
-        elif opcode == 0x36:
-            self._add(self.read_idata(self.get_reg(0)), True)
-            return 1
-
-        # ADDC A, @R1
-        elif opcode == 0x37:
-            self._add(self.read_idata(self.get_reg(1)), True)
-            return 1
-
-        # ADDC A, R0-R7
-        elif 0x38 <= opcode <= 0x3F:
-            self._add(self.get_reg(opcode & 0x07), True)
-            return 1
+        if op == 0x33:
+            def rlc_a():
+                a = sfr[IDX_ACC]
+                c = 1 if sfr[IDX_PSW] & 0x80 else 0
+                set_cy(a & 0x80)
+                sfr[IDX_ACC] = ((a << 1) | c) & 0xFF
+                return 1
+            return rlc_a
 
         # JC rel
-        elif opcode == 0x40:
-            rel = self.fetch()
-            if self.CY:
-                self.rel_jump(rel)
-            return 2
-
-        # ORL direct, A
-        elif opcode == 0x42:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) | self.A)
-            return 1
-
-        # ORL direct, #imm
-        elif opcode == 0x43:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) | imm)
-            return 2
-
-        # ORL A, #imm
-        elif opcode == 0x44:
-            self.A = self.A | self.fetch()
-            return 1
-
-        # ORL A, direct
-        elif opcode == 0x45:
-            addr = self.fetch()
-            self.A = self.A | self.get_direct(addr)
-            return 1
-
-        # ORL A, @R0
-        elif opcode == 0x46:
-            self.A = self.A | self.read_idata(self.get_reg(0))
-            return 1
-
-        # ORL A, @R1
-        elif opcode == 0x47:
-            self.A = self.A | self.read_idata(self.get_reg(1))
-            return 1
-
-        # ORL A, R0-R7
-        elif 0x48 <= opcode <= 0x4F:
-            self.A = self.A | self.get_reg(opcode & 0x07)
-            return 1
+        if op == 0x40:
+            def jc():
+                rel = fetch()
+                if sfr[IDX_PSW] & 0x80:
+                    rel_jump(rel)
+                return 2
+            return jc
 
         # JNC rel
-        elif opcode == 0x50:
-            rel = self.fetch()
-            if not self.CY:
-                self.rel_jump(rel)
-            return 2
-
-        # ANL direct, A
-        elif opcode == 0x52:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) & self.A)
-            return 1
-
-        # ANL direct, #imm
-        elif opcode == 0x53:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) & imm)
-            return 2
-
-        # ANL A, #imm
-        elif opcode == 0x54:
-            self.A = self.A & self.fetch()
-            return 1
-
-        # ANL A, direct
-        elif opcode == 0x55:
-            addr = self.fetch()
-            self.A = self.A & self.get_direct(addr)
-            return 1
-
-        # ANL A, @R0
-        elif opcode == 0x56:
-            self.A = self.A & self.read_idata(self.get_reg(0))
-            return 1
-
-        # ANL A, @R1
-        elif opcode == 0x57:
-            self.A = self.A & self.read_idata(self.get_reg(1))
-            return 1
-
-        # ANL A, R0-R7
-        elif 0x58 <= opcode <= 0x5F:
-            self.A = self.A & self.get_reg(opcode & 0x07)
-            return 1
+        if op == 0x50:
+            def jnc():
+                rel = fetch()
+                if not sfr[IDX_PSW] & 0x80:
+                    rel_jump(rel)
+                return 2
+            return jnc
 
         # JZ rel
-        elif opcode == 0x60:
-            rel = self.fetch()
-            if self.A == 0:
-                self.rel_jump(rel)
-            return 2
-
-        # XRL direct, A
-        elif opcode == 0x62:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) ^ self.A)
-            return 1
-
-        # XRL direct, #imm
-        elif opcode == 0x63:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, self.get_direct(addr) ^ imm)
-            return 2
-
-        # XRL A, #imm
-        elif opcode == 0x64:
-            self.A = self.A ^ self.fetch()
-            return 1
-
-        # XRL A, direct
-        elif opcode == 0x65:
-            addr = self.fetch()
-            self.A = self.A ^ self.get_direct(addr)
-            return 1
-
-        # XRL A, @R0
-        elif opcode == 0x66:
-            self.A = self.A ^ self.read_idata(self.get_reg(0))
-            return 1
-
-        # XRL A, @R1
-        elif opcode == 0x67:
-            self.A = self.A ^ self.read_idata(self.get_reg(1))
-            return 1
-
-        # XRL A, R0-R7
-        elif 0x68 <= opcode <= 0x6F:
-            self.A = self.A ^ self.get_reg(opcode & 0x07)
-            return 1
+        if op == 0x60:
+            def jz():
+                rel = fetch()
+                if sfr[IDX_ACC] == 0:
+                    rel_jump(rel)
+                return 2
+            return jz
 
         # JNZ rel
-        elif opcode == 0x70:
-            rel = self.fetch()
-            if self.A != 0:
-                self.rel_jump(rel)
-            return 2
+        if op == 0x70:
+            def jnz():
+                rel = fetch()
+                if sfr[IDX_ACC] != 0:
+                    rel_jump(rel)
+                return 2
+            return jnz
+
+        # ORL / ANL / XRL (0x42-0x4F, 0x52-0x5F, 0x62-0x6F)
+        if 0x42 <= op <= 0x6F and (op & 0x0F) >= 0x02:
+            alu = LOGIC_OPS[op & 0xF0]
+            low = op & 0x0F
+
+            if low == 0x02:  # direct, A
+                def logic_direct_a():
+                    addr = fetch()
+                    set_direct(addr, alu(get_direct(addr), sfr[IDX_ACC]))
+                    return 1
+                return logic_direct_a
+            if low == 0x03:  # direct, #imm
+                def logic_direct_imm():
+                    addr = fetch()
+                    imm = fetch()
+                    set_direct(addr, alu(get_direct(addr), imm))
+                    return 2
+                return logic_direct_imm
+            if low == 0x04:  # A, #imm
+                def logic_a_imm():
+                    sfr[IDX_ACC] = alu(sfr[IDX_ACC], fetch())
+                    return 1
+                return logic_a_imm
+            if low == 0x05:  # A, direct
+                def logic_a_direct():
+                    addr = fetch()
+                    sfr[IDX_ACC] = alu(sfr[IDX_ACC], get_direct(addr)) & 0xFF
+                    return 1
+                return logic_a_direct
+            if low in (0x06, 0x07):  # A, @R0 / @R1
+                def logic_a_indirect():
+                    sfr[IDX_ACC] = alu(sfr[IDX_ACC], read_idata(get_reg(ri))) & 0xFF
+                    return 1
+                return logic_a_indirect
+
+            def logic_a_reg():  # A, R0-R7
+                sfr[IDX_ACC] = alu(sfr[IDX_ACC], get_reg(n)) & 0xFF
+                return 1
+            return logic_a_reg
 
         # ORL C, bit
-        elif opcode == 0x72:
-            bit = self.fetch()
-            self.CY = self.CY or self.read_bit(bit)
-            return 2
+        if op == 0x72:
+            def orl_c_bit():
+                bit = fetch()
+                set_cy(sfr[IDX_PSW] & 0x80 or read_bit(bit))
+                return 2
+            return orl_c_bit
 
         # JMP @A+DPTR
-        elif opcode == 0x73:
-            self.pc = (self.A + self.DPTR) & 0xFFFF
-            return 2
+        if op == 0x73:
+            def jmp_a_dptr():
+                self.pc = (sfr[IDX_ACC] + ((sfr[IDX_DPH] << 8) | sfr[IDX_DPL])) & 0xFFFF
+                return 2
+            return jmp_a_dptr
 
         # MOV A, #imm
-        elif opcode == 0x74:
-            self.A = self.fetch()
-            return 1
+        if op == 0x74:
+            def mov_a_imm():
+                sfr[IDX_ACC] = fetch()
+                return 1
+            return mov_a_imm
 
         # MOV direct, #imm
-        elif opcode == 0x75:
-            addr = self.fetch()
-            imm = self.fetch()
-            self.set_direct(addr, imm)
-            return 2
-
-        # MOV @R0, #imm
-        elif opcode == 0x76:
-            imm = self.fetch()
-            self.write_idata(self.get_reg(0), imm)
-            return 1
-
-        # MOV @R1, #imm
-        elif opcode == 0x77:
-            imm = self.fetch()
-            self.write_idata(self.get_reg(1), imm)
-            return 1
+        if op == 0x75:
+            def mov_direct_imm():
+                addr = fetch()
+                imm = fetch()
+                set_direct(addr, imm)
+                return 2
+            return mov_direct_imm
+
+        # MOV @R0 / @R1, #imm
+        if op in (0x76, 0x77):
+            def mov_indirect_imm():
+                imm = fetch()
+                write_idata(get_reg(ri), imm)
+                return 1
+            return mov_indirect_imm
 
         # MOV R0-R7, #imm
-        elif 0x78 <= opcode <= 0x7F:
-            imm = self.fetch()
-            self.set_reg(opcode & 0x07, imm)
-            return 1
+        if 0x78 <= op <= 0x7F:
+            def mov_reg_imm():
+                set_reg(n, fetch())
+                return 1
+            return mov_reg_imm
 
         # SJMP rel
-        elif opcode == 0x80:
-            rel = self.fetch()
-            self.rel_jump(rel)
-            return 2
+        if op == 0x80:
+            def sjmp():
+                rel_jump(fetch())
+                return 2
+            return sjmp
 
         # ANL C, bit
-        elif opcode == 0x82:
-            bit = self.fetch()
-            self.CY = self.CY and self.read_bit(bit)
-            return 2
+        if op == 0x82:
+            def anl_c_bit():
+                bit = fetch()
+                set_cy(sfr[IDX_PSW] & 0x80 and read_bit(bit))
+                return 2
+            return anl_c_bit
 
         # MOVC A, @A+PC
-        elif opcode == 0x83:
-            addr = (self.A + self.pc) & 0xFFFF
-            self.A = self.read_code(addr)
-            return 2
+        if op == 0x83:
+            def movc_a_pc():
+                sfr[IDX_ACC] = self.read_code((sfr[IDX_ACC] + self.pc) & 0xFFFF) & 0xFF
+                return 2
+            return movc_a_pc
 
         # DIV AB
-        elif opcode == 0x84:
-            if self.B == 0:
-                self.OV = True
-            else:
-                q = self.A // self.B
-                r = self.A % self.B
-                self.A = q
-                self.B = r
-                self.OV = False
-            self.CY = False
-            return 4
+        if op == 0x84:
+            def div_ab():
+                a = sfr[IDX_ACC]
+                b = sfr[IDX_B]
+                psw = sfr[IDX_PSW] & 0x7B  # CY and OV cleared
+                if b == 0:
+                    psw |= 0x04
+                else:
+                    sfr[IDX_ACC] = a // b
+                    sfr[IDX_B] = a % b
+                sfr[IDX_PSW] = psw
+                return 4
+            return div_ab
 
         # MOV direct, direct
-        elif opcode == 0x85:
-            src = self.fetch()
-            dst = self.fetch()
-            self.set_direct(dst, self.get_direct(src))
-            return 2
-
-        # MOV direct, @R0
-        elif opcode == 0x86:
-            addr = self.fetch()
-            self.set_direct(addr, self.read_idata(self.get_reg(0)))
-            return 2
-
-        # MOV direct, @R1
-        elif opcode == 0x87:
-            addr = self.fetch()
-            self.set_direct(addr, self.read_idata(self.get_reg(1)))
-            return 2
+        if op == 0x85:
+            def mov_direct_direct():
+                src = fetch()
+                dst = fetch()
+                set_direct(dst, get_direct(src))
+                return 2
+            return mov_direct_direct
+
+        # MOV direct, @R0 / @R1
+        if op in (0x86, 0x87):
+            def mov_direct_indirect():
+                addr = fetch()
+                set_direct(addr, read_idata(get_reg(ri)))
+                return 2
+            return mov_direct_indirect
 
         # MOV direct, R0-R7
-        elif 0x88 <= opcode <= 0x8F:
-            addr = self.fetch()
-            self.set_direct(addr, self.get_reg(opcode & 0x07))
-            return 2
+        if 0x88 <= op <= 0x8F:
+            def mov_direct_reg():
+                addr = fetch()
+                set_direct(addr, get_reg(n))
+                return 2
+            return mov_direct_reg
 
         # MOV DPTR, #imm16
-        elif opcode == 0x90:
-            self.DPTR = self.fetch16()
-            return 2
+        if op == 0x90:
+            def mov_dptr_imm():
+                sfr[IDX_DPH] = fetch()
+                sfr[IDX_DPL] = fetch()
+                return 2
+            return mov_dptr_imm
 
         # MOV bit, C
-        elif opcode == 0x92:
-            bit = self.fetch()
-            self.write_bit(bit, self.CY)
-            return 2
+        if op == 0x92:
+            def mov_bit_c():
+                write_bit(fetch(), bool(sfr[IDX_PSW] & 0x80))
+                return 2
+            return mov_bit_c
 
         # MOVC A, @A+DPTR
-        elif opcode == 0x93:
-            addr = (self.A + self.DPTR) & 0xFFFF
-            self.A = self.read_code(addr)
-            return 2
-
-        # SUBB A, #imm
-        elif opcode == 0x94:
-            imm = self.fetch()
-            self._subb(imm)
-            return 1
-
-        # SUBB A, direct
-        elif opcode == 0x95:
-            addr = self.fetch()
-            self._subb(self.get_direct(addr))
-            return 1
-
-        # SUBB A, @R0
-        elif opcode == 0x96:
-            self._subb(self.read_idata(self.get_reg(0)))
-            return 1
-
-        # SUBB A, @R1
-        elif opcode == 0x97:
-            self._subb(self.read_idata(self.get_reg(1)))
-            return 1
-
-        # SUBB A, R0-R7
-        elif 0x98 <= opcode <= 0x9F:
-            self._subb(self.get_reg(opcode & 0x07))
-            return 1
+        if op == 0x93:
+            def movc_a_dptr():
+                dptr = (sfr[IDX_DPH] << 8) | sfr[IDX_DPL]
+                sfr[IDX_ACC] = self.read_code((sfr[IDX_ACC] + dptr) & 0xFFFF) & 0xFF
+                return 2
+            return movc_a_dptr
+
+        # SUBB A, <src> (0x94-0x9F)
+        if 0x94 <= op <= 0x9F:
+            if op == 0x94:  # #imm
+                def subb_imm():
+                    subb(fetch())
+                    return 1
+                return subb_imm
+            if op == 0x95:  # direct
+                def subb_direct():
+                    subb(get_direct(fetch()))
+                    return 1
+                return subb_direct
+            if op in (0x96, 0x97):  # @R0 / @R1
+                def subb_indirect():
+                    subb(read_idata(get_reg(ri)))
+                    return 1
+                return subb_indirect
+
+            def subb_reg():  # R0-R7
+                subb(get_reg(n))
+                return 1
+            return subb_reg
 
         # ORL C, /bit
-        elif opcode == 0xA0:
-            bit = self.fetch()
-            self.CY = self.CY or (not self.read_bit(bit))
-            return 2
+        if op == 0xA0:
+            def orl_c_nbit():
+                bit = fetch()
+                set_cy(sfr[IDX_PSW] & 0x80 or not read_bit(bit))
+                return 2
+            return orl_c_nbit
 
         # MOV C, bit
-        elif opcode == 0xA2:
-            bit = self.fetch()
-            self.CY = self.read_bit(bit)
-            return 1
+        if op == 0xA2:
+            def mov_c_bit():
+                set_cy(read_bit(fetch()))
+                return 1
+            return mov_c_bit
 
         # INC DPTR
-        elif opcode == 0xA3:
-            self.DPTR = (self.DPTR + 1) & 0xFFFF
-            return 2
+        if op == 0xA3:
+            def inc_dptr():
+                dpl = (sfr[IDX_DPL] + 1) & 0xFF
+                sfr[IDX_DPL] = dpl
+                if dpl == 0:
+                    sfr[IDX_DPH] = (sfr[IDX_DPH] + 1) & 0xFF
+                return 2
+            return inc_dptr
 
         # MUL AB
-        elif opcode == 0xA4:
-            result = self.A * self.B
-            self.A = result & 0xFF
-            self.B = (result >> 8) & 0xFF
-            self.CY = False
-            self.OV = (result > 0xFF)
-            return 4
+        if op == 0xA4:
+            def mul_ab():
+                result = sfr[IDX_ACC] * sfr[IDX_B]
+                sfr[IDX_ACC] = result & 0xFF
+                sfr[IDX_B] = result >> 8
+                psw = sfr[IDX_PSW] & 0x7B  # CY and OV cleared
+                if result > 0xFF:
+                    psw |= 0x04
+                sfr[IDX_PSW] = psw
+                return 4
+            return mul_ab
 
         # Reserved
-        elif opcode == 0xA5:
-            return 1
-
-        # MOV @R0, direct
-        elif opcode == 0xA6:
-            addr = self.fetch()
-            self.write_idata(self.get_reg(0), self.get_direct(addr))
-            return 2
-
-        # MOV @R1, direct
-        elif opcode == 0xA7:
-            addr = self.fetch()
-            self.write_idata(self.get_reg(1), self.get_direct(addr))
-            return 2
+        if op == 0xA5:
+            def reserved():
+                return 1
+            return reserved
+
+        # MOV @R0 / @R1, direct
+        if op in (0xA6, 0xA7):
+            def mov_indirect_direct():
+                addr = fetch()
+                write_idata(get_reg(ri), get_direct(addr))
+                return 2
+            return mov_indirect_direct
 
         # MOV R0-R7, direct
-        elif 0xA8 <= opcode <= 0xAF:
-            addr = self.fetch()
-            self.set_reg(opcode & 0x07, self.get_direct(addr))
-            return 2
+        if 0xA8 <= op <= 0xAF:
+            def mov_reg_direct():
+                set_reg(n, get_direct(fetch()))
+                return 2
+            return mov_reg_direct
 
         # ANL C, /bit
-        elif opcode == 0xB0:
-            bit = self.fetch()
-            self.CY = self.CY and (not self.read_bit(bit))
-            return 2
+        if op == 0xB0:
+            def anl_c_nbit():
+                bit = fetch()
+                set_cy(sfr[IDX_PSW] & 0x80 and not read_bit(bit))
+                return 2
+            return anl_c_nbit
 
         # CPL bit
-        elif opcode == 0xB2:
-            bit = self.fetch()
-            self.write_bit(bit, not self.read_bit(bit))
-            return 1
+        if op == 0xB2:
+            def cpl_bit():
+                bit = fetch()
+                write_bit(bit, not read_bit(bit))
+                return 1
+            return cpl_bit
 
         # CPL C
-        elif opcode == 0xB3:
-            self.CY = not self.CY
-            return 1
+        if op == 0xB3:
+            def cpl_c():
+                sfr[IDX_PSW] ^= 0x80
+                return 1
+            return cpl_c
 
         # CJNE A, #imm, rel
-        elif opcode == 0xB4:
-            imm = self.fetch()
-            rel = self.fetch()
-            self.CY = self.A < imm
-            if self.A != imm:
-                self.rel_jump(rel)
-            return 2
+        if op == 0xB4:
+            def cjne_a_imm():
+                imm = fetch()
+                rel = fetch()
+                a = sfr[IDX_ACC]
+                set_cy(a < imm)
+                if a != imm:
+                    rel_jump(rel)
+                return 2
+            return cjne_a_imm
 
         # CJNE A, direct, rel
-        elif opcode == 0xB5:
-            addr = self.fetch()
-            rel = self.fetch()
-            val = self.get_direct(addr)
-            self.CY = self.A < val
-            if self.A != val:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE @R0, #imm, rel
-        elif opcode == 0xB6:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.read_idata(self.get_reg(0))
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
-
-        # CJNE @R1, #imm, rel
-        elif opcode == 0xB7:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.read_idata(self.get_reg(1))
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
+        if op == 0xB5:
+            def cjne_a_direct():
+                addr = fetch()
+                rel = fetch()
+                val = get_direct(addr)
+                a = sfr[IDX_ACC]
+                set_cy(a < val)
+                if a != val:
+                    rel_jump(rel)
+                return 2
+            return cjne_a_direct
+
+        # CJNE @R0 / @R1, #imm, rel
+        if op in (0xB6, 0xB7):
+            def cjne_indirect_imm():
+                imm = fetch()
+                rel = fetch()
+                val = read_idata(get_reg(ri))
+                set_cy(val < imm)
+                if val != imm:
+                    rel_jump(rel)
+                return 2
+            return cjne_indirect_imm
 
         # CJNE R0-R7, #imm, rel
-        elif 0xB8 <= opcode <= 0xBF:
-            imm = self.fetch()
-            rel = self.fetch()
-            val = self.get_reg(opcode & 0x07)
-            self.CY = val < imm
-            if val != imm:
-                self.rel_jump(rel)
-            return 2
+        if 0xB8 <= op <= 0xBF:
+            def cjne_reg_imm():
+                imm = fetch()
+                rel = fetch()
+                val = get_reg(n)
+                set_cy(val < imm)
+                if val != imm:
+                    rel_jump(rel)
+                return 2
+            return cjne_reg_imm
 
         # PUSH direct
-        elif opcode == 0xC0:
-            addr = self.fetch()
-            self.push(self.get_direct(addr))
-            return 2
+        if op == 0xC0:
+            def push_direct():
+                push(get_direct(fetch()))
+                return 2
+            return push_direct
 
         # CLR bit
-        elif opcode == 0xC2:
-            bit = self.fetch()
-            self.write_bit(bit, False)
-            return 1
+        if op == 0xC2:
+            def clr_bit():
+                write_bit(fetch(), False)
+                return 1
+            return clr_bit
 
         # CLR C
-        elif opcode == 0xC3:
-            self.CY = False
-            return 1
+        if op == 0xC3:
+            def clr_c():
+                set_cy(False)
+                return 1
+            return clr_c
 
         # SWAP A
-        elif opcode == 0xC4:
-            a = self.A
-            self.A = ((a << 4) | (a >> 4)) & 0xFF
-            return 1
+        if op == 0xC4:
+            def swap_a():
+                a = sfr[IDX_ACC]
+                sfr[IDX_ACC] = ((a << 4) | (a >> 4)) & 0xFF
+                return 1
+            return swap_a
 
         # XCH A, direct
-        elif opcode == 0xC5:
-            addr = self.fetch()
-            tmp = self.A
-            self.A = self.get_direct(addr)
-            self.set_direct(addr, tmp)
-            return 1
-
-        # XCH A, @R0
-        elif opcode == 0xC6:
-            ptr = self.get_reg(0)
-            tmp = self.A
-            self.A = self.read_idata(ptr)
-            self.write_idata(ptr, tmp)
-            return 1
-
-        # XCH A, @R1
-        elif opcode == 0xC7:
-            ptr = self.get_reg(1)
-            tmp = self.A
-            self.A = self.read_idata(ptr)
-            self.write_idata(ptr, tmp)
-            return 1
+        if op == 0xC5:
+            def xch_direct():
+                addr = fetch()
+                tmp = sfr[IDX_ACC]
+                sfr[IDX_ACC] = get_direct(addr) & 0xFF
+                set_direct(addr, tmp)
+                return 1
+            return xch_direct
+
+        # XCH A, @R0 / @R1
+        if op in (0xC6, 0xC7):
+            def xch_indirect():
+                ptr = get_reg(ri)
+                tmp = sfr[IDX_ACC]
+                sfr[IDX_ACC] = read_idata(ptr) & 0xFF
+                write_idata(ptr, tmp)
+                return 1
+            return xch_indirect
 
         # XCH A, R0-R7
-        elif 0xC8 <= opcode <= 0xCF:
-            n = opcode & 0x07
-            tmp = self.A
-            self.A = self.get_reg(n)
-            self.set_reg(n, tmp)
-            return 1
+        if 0xC8 <= op <= 0xCF:
+            def xch_reg():
+                tmp = sfr[IDX_ACC]
+                sfr[IDX_ACC] = get_reg(n) & 0xFF
+                set_reg(n, tmp)
+                return 1
+            return xch_reg
 
         # POP direct
-        elif opcode == 0xD0:
-            addr = self.fetch()
-            self.set_direct(addr, self.pop())
-            return 2
+        if op == 0xD0:
+            def pop_direct():
+                addr = fetch()
+                set_direct(addr, pop())
+                return 2
+            return pop_direct
 
         # SETB bit
-        elif opcode == 0xD2:
-            bit = self.fetch()
-            self.write_bit(bit, True)
-            return 1
+        if op == 0xD2:
+            def setb_bit():
+                write_bit(fetch(), True)
+                return 1
+            return setb_bit
 
         # SETB C
-        elif opcode == 0xD3:
-            self.CY = True
-            return 1
+        if op == 0xD3:
+            def setb_c():
+                set_cy(True)
+                return 1
+            return setb_c
 
         # DA A (Decimal Adjust)
-        elif opcode == 0xD4:
-            a = self.A
-            cy = self.CY
-
-            if (a & 0x0F) > 9 or self.AC:
-                a += 6
-                if a > 0xFF:
-                    cy = True
-                    a &= 0xFF
-
-            if (a >> 4) > 9 or cy:
-                a += 0x60
-                if a > 0xFF:
-                    cy = True
-                    a &= 0xFF
-
-            self.A = a
-            self.CY = cy
-            return 1
+        if op == 0xD4:
+            def da_a():
+                a = sfr[IDX_ACC]
+                cy = sfr[IDX_PSW] & 0x80
+
+                if (a & 0x0F) > 9 or sfr[IDX_PSW] & 0x40:
+                    a += 6
+                    if a > 0xFF:
+                        cy = True
+                        a &= 0xFF
+
+                if (a >> 4) > 9 or cy:
+                    a += 0x60
+                    if a > 0xFF:
+                        cy = True
+                        a &= 0xFF
+
+                sfr[IDX_ACC] = a
+                set_cy(cy)
+                return 1
+            return da_a
 
         # DJNZ direct, rel
-        elif opcode == 0xD5:
-            addr = self.fetch()
-            rel = self.fetch()
-            val = (self.get_direct(addr) - 1) & 0xFF
-            self.set_direct(addr, val)
-            if val != 0:
-                self.rel_jump(rel)
-            return 2
-
-        # XCHD A, @R0
-        elif opcode == 0xD6:
-            ptr = self.get_reg(0)
-            val = self.read_idata(ptr)
-            self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
-            self.A = (self.A & 0xF0) | (val & 0x0F)
-            return 1
-
-        # XCHD A, @R1
-        elif opcode == 0xD7:
-            ptr = self.get_reg(1)
-            val = self.read_idata(ptr)
-            self.write_idata(ptr, (val & 0xF0) | (self.A & 0x0F))
-            self.A = (self.A & 0xF0) | (val & 0x0F)
-            return 1
+        if op == 0xD5:
+            def djnz_direct():
+                addr = fetch()
+                rel = fetch()
+                val = (get_direct(addr) - 1) & 0xFF
+                set_direct(addr, val)
+                if val != 0:
+                    rel_jump(rel)
+                return 2
+            return djnz_direct
+
+        # XCHD A, @R0 / @R1
+        if op in (0xD6, 0xD7):
+            def xchd_indirect():
+                ptr = get_reg(ri)
+                val = read_idata(ptr)
+                write_idata(ptr, (val & 0xF0) | (sfr[IDX_ACC] & 0x0F))
+                sfr[IDX_ACC] = (sfr[IDX_ACC] & 0xF0) | (val & 0x0F)
+                return 1
+            return xchd_indirect
 
         # DJNZ R0-R7, rel
-        elif 0xD8 <= opcode <= 0xDF:
-            rel = self.fetch()
-            n = opcode & 0x07
-            val = (self.get_reg(n) - 1) & 0xFF
-            self.set_reg(n, val)
-            if val != 0:
-                self.rel_jump(rel)
-            return 2
+        if 0xD8 <= op <= 0xDF:
+            def djnz_reg():
+                rel = fetch()
+                val = (get_reg(n) - 1) & 0xFF
+                set_reg(n, val)
+                if val != 0:
+                    rel_jump(rel)
+                return 2
+            return djnz_reg
 
         # MOVX A, @DPTR
-        elif opcode == 0xE0:
-            self.A = self.read_xdata(self.DPTR)
-            return 2
+        if op == 0xE0:
+            def movx_a_dptr():
+                sfr[IDX_ACC] = read_xdata((sfr[IDX_DPH] << 8) | sfr[IDX_DPL]) & 0xFF
+                return 2
+            return movx_a_dptr
+
+        # MOVX A, @R0 / @R1 (external with P2)
+        if op in (0xE2, 0xE3):
+            def movx_a_indirect():
+                p2 = read_sfr(self.SFR_P2)
+                addr = (p2 << 8) | get_reg(ri)
+                sfr[IDX_ACC] = read_xdata(addr) & 0xFF
+                return 2
+            return movx_a_indirect
 
         # CLR A
-        elif opcode == 0xE4:
-            self.A = 0
-            return 1
+        if op == 0xE4:
+            def clr_a():
+                sfr[IDX_ACC] = 0
+                return 1
+            return clr_a
 
         # MOV A, direct
-        elif opcode == 0xE5:
-            addr = self.fetch()
-            self.A = self.get_direct(addr)
-            return 1
-
-        # MOV A, @R0
-        elif opcode == 0xE6:
-            self.A = self.read_idata(self.get_reg(0))
-            return 1
-
-        # MOV A, @R1
-        elif opcode == 0xE7:
-            self.A = self.read_idata(self.get_reg(1))
-            return 1
+        if op == 0xE5:
+            def mov_a_direct():
+                sfr[IDX_ACC] = get_direct(fetch()) & 0xFF
+                return 1
+            return mov_a_direct
+
+        # MOV A, @R0 / @R1
+        if op in (0xE6, 0xE7):
+            def mov_a_indirect():
+                sfr[IDX_ACC] = read_idata(get_reg(ri)) & 0xFF
+                return 1
+            return mov_a_indirect
 
         # MOV A, R0-R7
-        elif 0xE8 <= opcode <= 0xEF:
-            self.A = self.get_reg(opcode & 0x07)
-            return 1
+        if 0xE8 <= op <= 0xEF:
+            def mov_a_reg():
+                sfr[IDX_ACC] = get_reg(n) & 0xFF
+                return 1
+            return mov_a_reg
 
         # MOVX @DPTR, A
-        elif opcode == 0xF0:
-            self.write_xdata(self.DPTR, self.A)
-            return 2
-
-        # MOVX A, @R0 (external with P2)
-        elif opcode == 0xE2:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(0)
-            self.A = self.read_xdata(addr)
-            return 2
-
-        # MOVX A, @R1 (external with P2)
-        elif opcode == 0xE3:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(1)
-            self.A = self.read_xdata(addr)
-            return 2
-
-        # MOVX @R0, A (external with P2)
-        elif opcode == 0xF2:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(0)
-            self.write_xdata(addr, self.A)
-            return 2
-
-        # MOVX @R1, A (external with P2)
-        elif opcode == 0xF3:
-            p2 = self.read_sfr(self.SFR_P2)
-            addr = (p2 << 8) | self.get_reg(1)
-            self.write_xdata(addr, self.A)
-            return 2
+        if op == 0xF0:
+            def movx_dptr_a():
+                write_xdata((sfr[IDX_DPH] << 8) | sfr[IDX_DPL], sfr[IDX_ACC])
+                return 2
+            return movx_dptr_a
+
+        # MOVX @R0 / @R1, A (external with P2)
+        if op in (0xF2, 0xF3):
+            def movx_indirect_a():
+                p2 = read_sfr(self.SFR_P2)
+                addr = (p2 << 8) | get_reg(ri)
+                write_xdata(addr, sfr[IDX_ACC])
+                return 2
+            return movx_indirect_a
 
         # CPL A - complement accumulator
-        elif opcode == 0xF4:
-            self.A = (~self.A) & 0xFF
-            return 1
+        if op == 0xF4:
+            def cpl_a():
+                sfr[IDX_ACC] = (~sfr[IDX_ACC]) & 0xFF
+                return 1
+            return cpl_a
 
         # MOV direct, A
-        elif opcode == 0xF5:
-            addr = self.fetch()
-            self.set_direct(addr, self.A)
-            return 1
-
-        # MOV @R0, A
-        elif opcode == 0xF6:
-            self.write_idata(self.get_reg(0), self.A)
-            return 1
-
-        # MOV @R1, A
-        elif opcode == 0xF7:
-            self.write_idata(self.get_reg(1), self.A)
-            return 1
+        if op == 0xF5:
+            def mov_direct_a():
+                set_direct(fetch(), sfr[IDX_ACC])
+                return 1
+            return mov_direct_a
+
+        # MOV @R0 / @R1, A
+        if op in (0xF6, 0xF7):
+            def mov_indirect_a():
+                write_idata(get_reg(ri), sfr[IDX_ACC])
+                return 1
+            return mov_indirect_a
 
         # MOV R0-R7, A
-        elif 0xF8 <= opcode <= 0xFF:
-            self.set_reg(opcode & 0x07, self.A)
-            return 1
+        if 0xF8 <= op <= 0xFF:
+            def mov_reg_a():
+                set_reg(n, sfr[IDX_ACC])
+                return 1
+            return mov_reg_a
 
-        else:
-            raise ValueError(f"Unknown opcode: 0x{opcode:02X} at PC=0x{self.pc-1:04X}")
+        def unknown():
+            raise ValueError(f"Unknown opcode: 0x{op:02X} at PC=0x{self.pc-1:04X}")
+        return unknown
 
     def _add(self, value: int, with_carry: bool):
         """ADD/ADDC helper - adds value to A with flags."""
-        a = self.A
-        c = (1 if self.CY else 0) if with_carry else 0
+        sfr = self.sfr
+        a = sfr[IDX_ACC]
+        psw = sfr[IDX_PSW]
+        c = (psw >> 7) if with_carry else 0
 
         result = a + value + c
 
+        psw &= 0x3B  # CY, AC and OV recomputed below
+
         # Carry from bit 7
-        self.CY = result > 0xFF
+        if result > 0xFF:
+            psw |= 0x80
 
         # Auxiliary carry from bit 3
-        self.AC = ((a & 0x0F) + (value & 0x0F) + c) > 0x0F
+        if ((a & 0x0F) + (value & 0x0F) + c) > 0x0F:
+            psw |= 0x40
 
         # Overflow: both operands same sign, result different sign
-        self.OV = ((a ^ result) & (value ^ result) & 0x80) != 0
+        if (a ^ result) & (value ^ result) & 0x80:
+            psw |= 0x04
 
-        self.A = result & 0xFF
+        sfr[IDX_PSW] = psw
+        sfr[IDX_ACC] = result & 0xFF
 
     def _subb(self, value: int):
         """SUBB helper - subtracts value and borrow from A with flags."""
-        a = self.A
-        c = 1 if self.CY else 0
+        sfr = self.sfr
+        a = sfr[IDX_ACC]
+        psw = sfr[IDX_PSW]
+        c = psw >> 7
 
         result = a - value - c
 
+        psw &= 0x3B  # CY, AC and OV recomputed below
+
         # Borrow from bit 8
-        self.CY = result < 0
+        if result < 0:
+            psw |= 0x80
 
         # Auxiliary borrow from bit 4
-        self.AC = ((a & 0x0F) - (value & 0x0F) - c) < 0
+        if ((a & 0x0F) - (value & 0x0F) - c) < 0:
+            psw |= 0x40
 
         # Overflow
-        self.OV = (((a ^ value) & (a ^ result)) & 0x80) != 0
+        if ((a ^ value) & (a ^ result)) & 0x80:
+            psw |= 0x04
 
-        self.A = result & 0xFF
+        sfr[IDX_PSW] = psw
+        sfr[IDX_ACC] = result & 0xFF
 
     def reset(self):
         """Reset CPU to initial state."""
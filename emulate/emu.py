@@ -23,19 +23,130 @@ import threading
 import time
 from pathlib import Path
 
+# emulate/ and the project root, resolved once at import
+EMULATE_DIR = Path(__file__).parent
+PROJECT_ROOT = EMULATE_DIR.parent
+
 # Add emulate directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(EMULATE_DIR))
 
-from cpu import CPU8051
+from cpu import CPU8051, IDX_DPX
 from memory import Memory, MemoryMap
 from peripherals import Peripherals
 from hardware import HardwareState, create_hardware_hooks
 from disasm8051 import INSTRUCTIONS
 
+# Instruction length in bytes per opcode (unknown opcodes count as 1)
+INST_LEN = bytes(INSTRUCTIONS[op][1] if op in INSTRUCTIONS else 1 for op in range(256))
+
+
+def _rel(b: int) -> int:
+    """Sign-extend a relative jump offset byte."""
+    return b if b < 128 else b - 256
+
+
+def _make_formatter(opcode: int):
+    """
+    Build the trace formatter for one opcode.
+
+    The operand format is resolved here, once, so the returned callable
+    only has to plug the operand bytes into a fixed template. Called with
+    the full instruction bytes (opcode first).
+    """
+    if opcode not in INSTRUCTIONS:
+        text = f"??? ({opcode:02X})"
+        return lambda b: text
+
+    mnemonic, size, operand_fmt = INSTRUCTIONS[opcode]
+    name = mnemonic.upper()
+
+    if operand_fmt is None:
+        return lambda b: name
+
+    # Register/implied operands (no extra bytes)
+    if size == 1:
+        text = f"{name} {operand_fmt}"
+        return lambda b: text
+
+    # DPTR with immediate 16-bit
+    if operand_fmt == 'DPTR,#data16':
+        return lambda b: f"{name} DPTR,#{(b[1] << 8) | b[2]:04X}"
+
+    # A with immediate byte or direct
+    if operand_fmt == 'A,#data':
+        return lambda b: f"{name} A,#{b[1]:02X}"
+    if operand_fmt == 'A,direct':
+        return lambda b: f"{name} A,{b[1]:02X}h"
+
+    # Direct with various operands
+    if operand_fmt in ('direct', 'bit'):
+        return lambda b: f"{name} {b[1]:02X}h"
+    if operand_fmt == 'direct,A':
+        return lambda b: f"{name} {b[1]:02X}h,A"
+    if operand_fmt == 'direct,#data':
+        return lambda b: f"{name} {b[1]:02X}h,#{b[2]:02X}"
+    if operand_fmt == 'direct,direct':
+        return lambda b: f"{name} {b[1]:02X}h,{b[2]:02X}h"
+    if operand_fmt.startswith(('direct,R', 'direct,@R')):
+        reg = operand_fmt.split(',')[1]
+        return lambda b: f"{name} {b[1]:02X}h,{reg}"
+    if operand_fmt in ('direct,rel', 'bit,rel'):
+        return lambda b: f"{name} {b[1]:02X}h,{_rel(b[2]):+d}"
+
+    # Register with immediate, direct or rel
+    if ',' in operand_fmt and operand_fmt.startswith(('R', '@R')):
+        reg, rest = operand_fmt.split(',', 1)
+        if rest == '#data':
+            return lambda b: f"{name} {reg},#{b[1]:02X}"
+        if rest == 'direct':
+            return lambda b: f"{name} {reg},{b[1]:02X}h"
+        if rest == 'rel':
+            return lambda b: f"{name} {reg},{_rel(b[1]):+d}"
+        if rest == '#data,rel':
+            return lambda b: f"{name} {reg},#{b[1]:02X},{_rel(b[2]):+d}"
+
+    # Addresses
+    if operand_fmt == 'addr16':
+        return lambda b: f"{name} {(b[1] << 8) | b[2]:04X}h"
+    if operand_fmt == 'addr11':
+        high_bits = (opcode >> 5) & 0x07
+        return lambda b: f"{name} {(high_bits << 8) | b[1]:03X}h"
+
+    # Relative jumps
+    if operand_fmt == 'rel':
+        return lambda b: f"{name} {_rel(b[1]):+d}"
+
+    # Bit operations
+    if operand_fmt == 'bit,C':
+        return lambda b: f"{name} {b[1]:02X}h,C"
+    if operand_fmt == 'C,bit':
+        return lambda b: f"{name} C,{b[1]:02X}h"
+    if operand_fmt == 'C,/bit':
+        return lambda b: f"{name} C,/{b[1]:02X}h"
+
+    # CJNE variants
+    if operand_fmt == 'A,#data,rel':
+        return lambda b: f"{name} A,#{b[1]:02X},{_rel(b[2]):+d}"
+    if operand_fmt == 'A,direct,rel':
+        return lambda b: f"{name} A,{b[1]:02X}h,{_rel(b[2]):+d}"
+
+    # Default: just show mnemonic with hex operands
+    return lambda b: f"{name} " + ','.join(f"{x:02X}h" for x in b[1:size])
+
+
+# Per-opcode trace formatters, indexed by opcode byte
+FORMATTERS = tuple(_make_formatter(op) for op in range(256))
+
 
 class Emulator:
     """ASM2464PD Firmware Emulator."""
 
+    # Instructions executed per _run_block() call between limit checks
+    BLOCK_STEPS = 4096
+
+    # Most cycles any single instruction takes (DIV AB / MUL AB)
+    MAX_INST_CYCLES = 4
+
     def __init__(self, trace: bool = False, log_hw: bool = False,
                  log_uart: bool = True, usb_delay: int = 200000,
                  proxy: 'UARTProxy' = None, proxy_mask: list = None):
@@ -50,6 +161,8 @@ class Emulator:
             write_sfr=self.memory.write_sfr,
             read_bit=self.memory.read_bit,
             write_bit=self.memory.write_bit,
+            sfr=self.memory.sfr,
+            code=self.memory.code,
             trace=trace,
         )
 
@@ -82,6 +195,9 @@ class Emulator:
         # Debugging: PC hit statistics (for analysis)
         self.pc_stats = {}  # PC -> hit count
 
+        # Trace disassembly cache: (bank << 16 | pc) -> (hex_bytes, mnemonic)
+        self._disasm_cache = {}
+
         # USB device emulation
         self.usb_device = None
         self.usb_thread = None
@@ -107,6 +223,7 @@ class Emulator:
         
         print(f"Loaded {len(data)} bytes from {path}")
         self.memory.load_firmware(data)
+        self._disasm_cache.clear()
         # Load USB3 config descriptor from ROM and fix wTotalLength
         self.hw.load_config_descriptor_from_rom()
 
@@ -137,7 +254,6 @@ class Emulator:
 
         # Check for trace PC addresses
         if pc in self.trace_pcs:
-            self.trace_pc_hits[pc] = self.trace_pc_hits.get(pc, 0) + 1
             self._trace_pc_hit(pc)
 
         # Check hardware trace points
@@ -199,17 +315,13 @@ class Emulator:
                 print(f"[{self.hw.cycles:8d}] [EMU] Triggering interrupt: {int_name}")
 
     def _trace_pc_hit(self, pc: int):
-        """Log when a traced PC is hit."""
+        """Count and log a hit on a traced PC."""
+        hit_count = self.trace_pc_hits.get(pc, 0) + 1
+        self.trace_pc_hits[pc] = hit_count
         bank = self.memory.read_sfr(0x96) & 1
-        hit_count = self.trace_pc_hits[pc]
 
         # Get instruction for context
-        opcode = self.memory.read_code(pc)
-        inst_bytes = [opcode]
-        inst_len = self._get_inst_length(opcode)
-        for i in range(1, inst_len):
-            inst_bytes.append(self.memory.read_code((pc + i) & 0xFFFF))
-        mnemonic = self._disassemble(inst_bytes)
+        _, mnemonic = self._decode_at(pc, bank)
 
         # Show CPU state
         a = self.cpu.A
@@ -253,20 +365,159 @@ class Emulator:
         self.memory.xdata_read_hooks[addr] = watch_read
         self.memory.xdata_write_hooks[addr] = watch_write
 
+    def _pc_hooks(self) -> dict:
+        """
+        Collect every PC-triggered debug hook into one PC -> fn(pc) table.
+
+        Trace PCs and hardware trace points only need to run when execution
+        reaches their address, so the fast loop looks the PC up in one table
+        instead of checking each source on every instruction.
+        Hooks sharing a PC run in the same order as in step().
+        """
+        hooks = {}
+
+        def add(pc, fn):
+            prev = hooks.get(pc)
+            if prev is None:
+                hooks[pc] = fn
+            else:
+                def both(pc, first=prev, second=fn):
+                    first(pc)
+                    second(pc)
+                hooks[pc] = both
+
+        for pc in self.trace_pcs:
+            add(pc, self._trace_pc_hit)
+        if self.hw.trace_enabled:
+            for pc in self.hw.trace_points:
+                add(pc, self.hw.check_trace)
+        return hooks
+
+    def _run_block(self, max_steps: int, pc_hooks: dict = None) -> int:
+        """
+        Execute up to max_steps instructions in one tight loop.
+
+        Same effect as calling step() repeatedly while tracing and the proxy
+        are off, but with the CPU fetch/dispatch/interrupt sequence inlined
+        and everything it touches bound to locals (last_pc is not updated).
+        pc_hooks (from _pc_hooks()) costs one dict lookup per instruction
+        when non-empty. Breakpoints are checked against the live set, so
+        ones added by a hook mid-block still stop. Stops early on halt; the
+        caller keeps max_steps within the run limits. Returns the number
+        of instructions executed.
+        """
+        cpu = self.cpu
+        dispatch = cpu._dispatch
+        read_code = cpu.read_code
+        code = cpu.code
+        sfr = cpu.sfr
+        check_interrupts = cpu._check_interrupts
+        breakpoints = cpu.breakpoints
+        tick = self.hw.tick
+        pc_stats = self.pc_stats
+
+        executed = 0
+        while executed < max_steps:
+            if cpu.halted:
+                break
+
+            pc = cpu.pc
+            if pc_stats is not None:
+                pc_stats[pc] = pc_stats.get(pc, 0) + 1
+            executed += 1
+
+            if pc_hooks:
+                hook = pc_hooks.get(pc)
+                if hook is not None:
+                    hook(pc)
+            if pc in breakpoints:
+                cpu.halted = True
+                tick(0, cpu)
+                break
+
+            if pc < 0x8000 or not sfr[IDX_DPX] & 1:
+                opcode = code[pc]
+            else:
+                opcode = read_code(pc)
+            cpu.pc = (pc + 1) & 0xFFFF
+            cycles = dispatch[opcode]()
+            cpu.cycles += cycles
+            check_interrupts()
+            tick(cycles, cpu)
+
+        self.inst_count += executed
+        return executed
+
     def run(self, max_cycles: int = None, max_instructions: int = None) -> str:
         """
         Run emulator until halt, breakpoint, or limit reached.
 
         Returns reason for stopping.
         """
+        no_limit = 1 << 62
+        max_cycles = max_cycles or no_limit
+        max_instructions = max_instructions or no_limit
+
+        # USB delays may have been changed since the last run
+        self.hw.reschedule()
+
+        # Debug hooks don't change mid-run, so pick the loop once
+        if self.cpu.trace or self.proxy:
+            return self._run_traced(max_cycles, max_instructions)
+        return self._run_fast(max_cycles, max_instructions)
+
+    def _steps_within_limits(self, max_cycles: int, max_instructions: int) -> int:
+        """
+        Number of instructions that can run before either limit is reached.
+
+        No instruction takes more than MAX_INST_CYCLES, so this many steps
+        never carry cpu.cycles past max_cycles before the last one starts.
+        Returns 0 once a limit has been hit.
+        """
+        cycles_left = max_cycles - self.cpu.cycles
+        insts_left = max_instructions - self.inst_count
+        if cycles_left <= 0 or insts_left <= 0:
+            return 0
+        per_inst = self.MAX_INST_CYCLES
+        return min(self.BLOCK_STEPS, insts_left, (cycles_left + per_inst - 1) // per_inst)
+
+    def _limit_reason(self, max_cycles: int) -> str:
+        """Stop reason once _steps_within_limits() returned 0."""
+        if self.cpu.cycles >= max_cycles:
+            return "max_cycles"
+        return "max_instructions"
+
+    def _run_traced(self, max_cycles: int, max_instructions: int) -> str:
+        """Run one step() at a time so every per-instruction hook fires."""
+        cpu = self.cpu
+        step = self.step
+        steps_within_limits = self._steps_within_limits
+        while True:
+            steps = steps_within_limits(max_cycles, max_instructions)
+            if not steps:
+                return self._limit_reason(max_cycles)
+
+            for _ in range(steps):
+                if not step():
+                    if cpu.pc in cpu.breakpoints:
+                        return "breakpoint"
+                    return "halted"
+
+    def _run_fast(self, max_cycles: int, max_instructions: int) -> str:
+        """Run in _run_block() chunks when no per-instruction hooks are active."""
+        cpu = self.cpu
+        run_block = self._run_block
+        pc_hooks = self._pc_hooks()
+        steps_within_limits = self._steps_within_limits
         while True:
-            if max_cycles and self.cpu.cycles >= max_cycles:
-                return "max_cycles"
-            if max_instructions and self.inst_count >= max_instructions:
-                return "max_instructions"
+            steps = steps_within_limits(max_cycles, max_instructions)
+            if not steps:
+                return self._limit_reason(max_cycles)
+
+            run_block(steps, pc_hooks)
 
-            if not self.step():
-                if self.cpu.pc in self.cpu.breakpoints:
+            if cpu.halted:
+                if cpu.pc in cpu.breakpoints:
                     return "breakpoint"
                 return "halted"
 
@@ -274,17 +525,7 @@ class Emulator:
         """Print trace of current instruction."""
         pc = self.cpu.pc
         bank = self.memory.read_sfr(0x96) & 1
-        opcode = self.memory.read_code(pc)
-
-        # Get instruction bytes
-        inst_bytes = [opcode]
-        inst_len = self._get_inst_length(opcode)
-        for i in range(1, inst_len):
-            inst_bytes.append(self.memory.read_code((pc + i) & 0xFFFF))
-
-        # Format instruction
-        hex_bytes = ' '.join(f'{b:02X}' for b in inst_bytes)
-        mnemonic = self._disassemble(inst_bytes)
+        hex_bytes, mnemonic = self._decode_at(pc, bank)
 
         # CPU state
         a = self.cpu.A
@@ -292,138 +533,42 @@ class Emulator:
         sp = self.cpu.SP
         dptr = self.cpu.DPTR
 
-        print(f"[{bank}] {pc:04X}: {hex_bytes:12s} {mnemonic:20s} "
-              f"A={a:02X} PSW={psw:02X} SP={sp:02X} DPTR={dptr:04X}")
+        # One write per line; print() costs a separate write for the newline
+        sys.stdout.write(f"[{bank}] {pc:04X}: {hex_bytes:12s} {mnemonic:20s} "
+                         f"A={a:02X} PSW={psw:02X} SP={sp:02X} DPTR={dptr:04X}\n")
+
+    def _decode_at(self, pc: int, bank: int) -> tuple:
+        """
+        Decode the instruction at pc for trace output.
+
+        Returns (hex_bytes, mnemonic). Results are cached per (bank, pc)
+        since firmware loops revisit the same addresses over and over;
+        code memory only changes in load_firmware(), which clears the cache.
+        """
+        key = (bank << 16) | pc
+        entry = self._disasm_cache.get(key)
+        if entry is None:
+            inst_len = INST_LEN[self.memory.read_code(pc)]
+            inst_bytes = self.memory.read_code_slice(pc, inst_len)
+
+            hex_bytes = ' '.join(f'{b:02X}' for b in inst_bytes)
+            entry = (hex_bytes, self._disassemble(inst_bytes))
+            self._disasm_cache[key] = entry
+        return entry
 
     def _get_inst_length(self, opcode: int) -> int:
         """Get instruction length in bytes using instruction table."""
-        if opcode in INSTRUCTIONS:
-            return INSTRUCTIONS[opcode][1]  # Size is second element of tuple
-        return 1  # Default for unknown opcodes
+        return INST_LEN[opcode]
 
-    def _disassemble(self, inst_bytes: list) -> str:
+    def _disassemble(self, inst_bytes: bytes) -> str:
         """Simple disassembler for trace output using full instruction set."""
         opcode = inst_bytes[0]
 
-        # Use full instruction table from disasm8051
-        if opcode not in INSTRUCTIONS:
-            return f"??? ({opcode:02X})"
-
-        mnemonic, size, operand_fmt = INSTRUCTIONS[opcode]
-
         # Check we have enough bytes
-        if len(inst_bytes) < size:
+        if len(inst_bytes) < INST_LEN[opcode]:
             return f"??? ({opcode:02X})"
 
-        # Format operands
-        if operand_fmt is None:
-            return mnemonic.upper()
-
-        # Get operand bytes
-        operands = inst_bytes[1:size]
-
-        # Handle specific operand formats
-        if operand_fmt == 'A':
-            return f"{mnemonic.upper()} A"
-        elif operand_fmt == 'C':
-            return f"{mnemonic.upper()} C"
-        elif operand_fmt == 'AB':
-            return f"{mnemonic.upper()} AB"
-        elif operand_fmt == 'DPTR':
-            return f"{mnemonic.upper()} DPTR"
-        elif operand_fmt == '@A+DPTR':
-            return f"{mnemonic.upper()} @A+DPTR"
-        elif operand_fmt == '@A+PC':
-            return f"{mnemonic.upper()} @A+PC"
-
-        # Register operands (no extra bytes)
-        elif operand_fmt in ('R0', 'R1', 'R2', 'R3', 'R4', 'R5', 'R6', 'R7',
-                             '@R0', '@R1', 'A,@R0', 'A,@R1', '@R0,A', '@R1,A'):
-            return f"{mnemonic.upper()} {operand_fmt.upper()}"
-
-        # DPTR with immediate 16-bit
-        elif operand_fmt == 'DPTR,#data16':
-            val = (operands[0] << 8) | operands[1]
-            return f"{mnemonic.upper()} DPTR,#{val:04X}"
-
-        # A with immediate byte
-        elif operand_fmt == 'A,#data':
-            return f"{mnemonic.upper()} A,#{operands[0]:02X}"
-        elif operand_fmt == 'A,direct':
-            return f"{mnemonic.upper()} A,{operands[0]:02X}h"
-
-        # Direct with various operands
-        elif operand_fmt == 'direct':
-            return f"{mnemonic.upper()} {operands[0]:02X}h"
-        elif operand_fmt == 'direct,A':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,A"
-        elif operand_fmt == 'direct,#data':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,#{operands[1]:02X}"
-        elif operand_fmt == 'direct,direct':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{operands[1]:02X}h"
-        elif operand_fmt.startswith('direct,R'):
-            reg = operand_fmt.split(',')[1]
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{reg}"
-        elif operand_fmt.startswith('direct,@R'):
-            reg = operand_fmt.split(',')[1]
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{reg}"
-        elif operand_fmt == 'direct,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{rel:+d}"
-
-        # Register with immediate or direct
-        elif ',' in operand_fmt and operand_fmt.startswith(('R', '@R')):
-            reg, rest = operand_fmt.split(',', 1)
-            if rest == '#data':
-                return f"{mnemonic.upper()} {reg},#{operands[0]:02X}"
-            elif rest == 'direct':
-                return f"{mnemonic.upper()} {reg},{operands[0]:02X}h"
-            elif rest == 'rel':
-                rel = operands[0] if operands[0] < 128 else operands[0] - 256
-                return f"{mnemonic.upper()} {reg},{rel:+d}"
-
-        # Addresses
-        elif operand_fmt == 'addr16':
-            addr = (operands[0] << 8) | operands[1]
-            return f"{mnemonic.upper()} {addr:04X}h"
-        elif operand_fmt == 'addr11':
-            high_bits = (opcode >> 5) & 0x07
-            addr = (high_bits << 8) | operands[0]
-            return f"{mnemonic.upper()} {addr:03X}h"
-
-        # Relative jumps
-        elif operand_fmt == 'rel':
-            rel = operands[0] if operands[0] < 128 else operands[0] - 256
-            return f"{mnemonic.upper()} {rel:+d}"
-
-        # Bit operations
-        elif operand_fmt == 'bit':
-            return f"{mnemonic.upper()} {operands[0]:02X}h"
-        elif operand_fmt == 'bit,C':
-            return f"{mnemonic.upper()} {operands[0]:02X}h,C"
-        elif operand_fmt == 'C,bit':
-            return f"{mnemonic.upper()} C,{operands[0]:02X}h"
-        elif operand_fmt == 'C,/bit':
-            return f"{mnemonic.upper()} C,/{operands[0]:02X}h"
-        elif operand_fmt == 'bit,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {operands[0]:02X}h,{rel:+d}"
-
-        # CJNE variants
-        elif operand_fmt == 'A,#data,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} A,#{operands[0]:02X},{rel:+d}"
-        elif operand_fmt == 'A,direct,rel':
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} A,{operands[0]:02X}h,{rel:+d}"
-        elif operand_fmt.endswith(',#data,rel'):
-            reg = operand_fmt.split(',')[0]
-            rel = operands[1] if operands[1] < 128 else operands[1] - 256
-            return f"{mnemonic.upper()} {reg},#{operands[0]:02X},{rel:+d}"
-
-        # Default: just show mnemonic with hex operands
-        operand_str = ','.join(f"{b:02X}h" for b in operands)
-        return f"{mnemonic.upper()} {operand_str}"
+        return FORMATTERS[opcode](inst_bytes)
 
     def dump_state(self):
         """Print current CPU and memory state."""
@@ -468,7 +613,7 @@ class Emulator:
         """Dump specific hardware register values."""
         print("\n=== Hardware Registers ===")
         for addr in addrs:
-            val = self.hw.regs.get(addr, 0)
+            val = self.hw.regs[addr]
             print(f"  0x{addr:04X}: 0x{val:02X}")
 
     # ============================================
@@ -662,9 +807,8 @@ Examples:
     # Find firmware file
     fw_path = args.firmware
     if not os.path.exists(fw_path):
-        # Try relative to script directory
-        script_dir = Path(__file__).parent.parent
-        fw_path = script_dir / args.firmware
+        # Try relative to the project root
+        fw_path = PROJECT_ROOT / args.firmware
         if not fw_path.exists():
             print(f"Error: Cannot find firmware file: {args.firmware}")
             sys.exit(1)
@@ -692,7 +836,7 @@ Examples:
             
             # Clear any interrupts that fired during boot/test
             # These are from hardware state, not from firmware execution
-            proxy.pending_interrupts = []
+            proxy.pending_interrupts.clear()
         except Exception as e:
             print(f"Error: Failed to connect to UART proxy: {e}")
             print("Make sure:")
@@ -710,6 +854,14 @@ Examples:
             addr = int(mask_str, 16)
             proxy_mask.append((addr, addr + 1))
     
+    # Instruction traces print a line per step; on a terminal stdout is
+    # line buffered, which means a write() syscall per instruction. Block
+    # buffer instead - everything still goes through sys.stdout, so trace
+    # lines stay in order with UART/HW output. Raw UART output flushes at
+    # each newline, which also pushes out the trace lines before it.
+    if args.trace and sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False)
+
     # Create emulator
     emu = Emulator(trace=args.trace, log_hw=args.log_hw,
                    log_uart=not args.no_uart_log, usb_delay=args.usb_delay,
@@ -9,11 +9,16 @@ RAM (XDATA < 0x6000) is handled by the memory system, not this module.
 from typing import TYPE_CHECKING, Dict, Set, Callable, Optional
 from dataclasses import dataclass, field
 from enum import IntEnum
+from array import array
 import re
 import os
+import sys
+
+from memory import CallbackTable
 
 if TYPE_CHECKING:
     from memory import Memory
+    from cpu import CPU8051
 
 # =============================================================================
 # Register Name Lookup
@@ -281,17 +286,14 @@ class USBController:
 
         # Write CDB to USB interface registers (0x910D-0x9112)
         # Firmware reads these at 0x31C0+ to get command data
-        for i, b in enumerate(cdb):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb)] = cdb
 
         # Also populate 0x911F-0x9122 (another CDB location read by 0x3186)
-        for i, b in enumerate(cdb[:4]):
-            self.hw.regs[0x911F + i] = b
+        self.hw.regs[0x911F:0x911F + 4] = cdb[:4]
 
         # USB endpoint buffers
-        for i, b in enumerate(cdb):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb)] = cdb
+        self.hw.usb_ep0_buf[:len(cdb)] = cdb
         self.hw.usb_ep0_len = len(cdb)
 
         # USB connection and interrupt status
@@ -417,13 +419,11 @@ class USBController:
         # =====================================================
 
         # Write CDB to USB interface registers (0x910D-0x911C)
-        for i, b in enumerate(cdb):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb)] = cdb
 
         # USB endpoint buffers - write CDB
-        for i, b in enumerate(cdb):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb)] = cdb
+        self.hw.usb_ep0_buf[:len(cdb)] = cdb
         self.hw.usb_ep0_len = len(cdb)
 
         # USB connection and interrupt status
@@ -515,17 +515,14 @@ class USBController:
         # =====================================================
 
         # Write CDB to USB interface registers (0x910D-0x911C)
-        for i, b in enumerate(cdb_padded):
-            self.hw.regs[0x910D + i] = b
+        self.hw.regs[0x910D:0x910D + len(cdb_padded)] = cdb_padded
 
         # Also write to alternate CDB locations firmware may check
-        for i, b in enumerate(cdb_padded):
-            self.hw.regs[0x911F + i] = b
+        self.hw.regs[0x911F:0x911F + len(cdb_padded)] = cdb_padded
 
         # USB endpoint buffers
-        for i, b in enumerate(cdb_padded):
-            self.hw.usb_ep_data_buf[i] = b
-            self.hw.usb_ep0_buf[i] = b
+        self.hw.usb_ep_data_buf[:len(cdb_padded)] = cdb_padded
+        self.hw.usb_ep0_buf[:len(cdb_padded)] = cdb_padded
         self.hw.usb_ep0_len = len(cdb_padded)
 
         # USB connection and interrupt status
@@ -788,6 +785,246 @@ class USBController:
         print(f"[{cycles:8d}] [USB_CTRL] Control transfer injected (interrupt pending)")
 
 
+# =============================================================================
+# Register Storage
+# =============================================================================
+# MMIO state is kept in flat tables indexed directly by the 16-bit XDATA
+# address, so the per-access path is an array index instead of a dict lookup.
+# Each table keeps a dict-style get() for the callers written against dicts.
+
+# Read modes: simple poll-driven register behaviours that read() applies
+# inline from HardwareState.read_mode instead of calling a Python callback.
+READ_PLAIN = 0            # Return regs[addr]
+READ_AUTO_CLEAR_BIT0 = 1  # Busy flag: bit 0 drops once polled AUTO_CLEAR_POLLS times
+READ_AUTO_SET_BIT1 = 2    # Completion flag: bit 1 sets once polled AUTO_SET_POLLS times
+READ_FIXED = 3            # Status that always reads its REGISTER_DEFAULTS value
+
+# Write modes, applied inline by write() from HardwareState.write_mode
+WRITE_PLAIN = 0           # Store to regs[addr]
+WRITE_TIMER_CSR = 1       # Timer CSR: bit 2 acks (clears bit 1) and restarts the poll count
+
+AUTO_CLEAR_POLLS = 3
+AUTO_SET_POLLS = 2
+
+# Cycles between periodic timer interrupts (0xC806 bit 0)
+TIMER_IRQ_PERIOD = 1000
+
+class RegisterFile(bytearray):
+    """
+    64 KiB register file, initialised from REGISTER_DEFAULTS.
+    Every address has a value, so get() never misses; its default is only
+    accepted for compatibility with dict-style callers.
+    """
+
+    def __init__(self, data: bytes = None):
+        super().__init__(REGISTER_DEFAULTS if data is None else data)
+
+    def __contains__(self, addr: int) -> bool:
+        return 0 <= addr < len(self)
+
+    def get(self, addr: int, default: int = 0) -> int:
+        return self[addr]
+
+
+class PollCounts(array):
+    """
+    Per-address read counters, all starting at 0.
+    get() never misses; its default is only accepted for compatibility.
+    """
+
+    def __new__(cls):
+        return super().__new__(cls, 'L', bytes(array('L').itemsize * 0x10000))
+
+    def __contains__(self, addr: int) -> bool:
+        return 0 <= addr < len(self)
+
+    def get(self, addr: int, default: int = 0) -> int:
+        return self[addr]
+
+
+def _register_defaults() -> bytes:
+    """
+    Power-on values for hardware registers, built once at import.
+    Only addresses >= 0x6000 are hardware registers.
+    """
+    regs = bytearray(0x10000)
+
+    # ============================================
+    # USB Controller Registers (0x9xxx)
+    # ============================================
+    regs[0x9000] = 0x00  # USB status - bit 7 = connected
+    regs[0x90E0] = 0x00  # USB speed
+    regs[0x9100] = 0x00  # USB link status
+    regs[0x9105] = 0x00  # USB PHY status
+    regs[0x91C0] = 0x02  # USB PHY control
+    regs[0x91D0] = 0x00  # USB PHY config
+
+    # ============================================
+    # Power Management Registers (0x92xx)
+    # ============================================
+    regs[0x92C0] = 0x81  # Power enable
+    regs[0x92C1] = 0x03  # Clocks enabled
+    regs[0x92C2] = 0x40  # Power state - bit 6 enables PD task path at 0xBF44
+    regs[0x92C5] = 0x04  # PHY powered
+    regs[0x92E0] = 0x02  # Power domain
+    regs[0x92F7] = 0x40  # Power status
+    regs[0x92FB] = 0x01  # Power sequence complete (checked at 0x9C42)
+
+    # ============================================
+    # PD Event Registers (0xE4xx)
+    # ============================================
+    # These control the debug output at 0xAE89/0xAF5E
+    # Set initial PD event to trigger debug output
+    regs[0xE40F] = 0x00  # PD event type - will be set during PD events
+    regs[0xE410] = 0x00  # PD sub-event
+
+    # ============================================
+    # PCIe Registers (0xBxxx)
+    # ============================================
+    regs[0xB238] = 0x00  # PCIe trigger - not busy
+    regs[0xB254] = 0x00  # PCIe trigger write
+    regs[0xB296] = 0x00  # PCIe status - bit 2 set when DMA complete
+    regs[0xB401] = 0x01  # PCIe tunnel enabled
+    regs[0xB480] = 0x00  # PCIe link initially down (bit 0 = 0)
+    # This allows USB state machine to return R7=5 at 0x3FC6 instead of state=11
+
+    # ============================================
+    # UART Registers (0xC0xx)
+    # ============================================
+    regs[0xC000] = 0x00  # UART TX data
+    regs[0xC001] = 0x00  # UART TX data (alt)
+    regs[0xC009] = 0x60  # UART LSR - TX empty, ready
+
+    # ============================================
+    # NVMe Controller Registers (0xC4xx, 0xC5xx)
+    # ============================================
+    regs[0xC412] = 0x02  # NVMe ready
+    regs[0xC471] = 0x00  # NVMe queue busy - bit 0 = queue busy
+    regs[0xC47A] = 0x00  # NVMe command status
+    regs[0xC520] = 0x80  # NVMe link ready
+
+    # ============================================
+    # PHY Registers (0xC6xx)
+    # ============================================
+    regs[0xC620] = 0x00  # PHY control
+    regs[0xC655] = 0x08  # PHY config
+    regs[0xC65A] = 0x09  # PHY config
+    regs[0xC6B3] = 0x30  # PHY status - bits 4,5 set
+
+    # ============================================
+    # Interrupt/DMA/Flash Registers (0xC8xx)
+    # ============================================
+    regs[0xC800] = 0x00  # Interrupt status
+    regs[0xC802] = 0x00  # Interrupt status 2
+    regs[0xC806] = 0x00  # System interrupt status
+    regs[0xC80A] = 0x00  # PCIe/NVMe interrupt - bit 6 triggers PD debug
+    regs[0xC8A9] = 0x00  # Flash CSR - not busy
+    regs[0xC8AA] = 0x00  # Flash command
+    regs[0xC8AB] = 0x00  # Flash address high
+    regs[0xC8AC] = 0x00  # Flash address mid
+    regs[0xC8AD] = 0x00  # Flash address low
+    regs[0xC8AE] = 0x00  # Flash data register
+    regs[0xC8B8] = 0x00  # Flash/DMA status
+    regs[0xC8D6] = 0x04  # DMA status - done
+
+    # ============================================
+    # USB Power Delivery (PD) Registers (0xCAxx)
+    # ============================================
+    regs[0xCA00] = 0x00  # PD control
+    regs[0xCA06] = 0x00  # PD status
+    regs[0xCA0A] = 0x00  # PD interrupt control
+    regs[0xCA0D] = 0x00  # PD interrupt status 1 - bit 3 = interrupt pending
+    regs[0xCA0E] = 0x00  # PD interrupt status 2 - bit 2 = interrupt pending
+    regs[0xCA81] = 0x00  # PD extended status
+
+    # ============================================
+    # Timer/CPU Control Registers (0xCCxx, 0xCDxx)
+    # ============================================
+    regs[0xCC11] = 0x00  # Timer 0 CSR
+    regs[0xCC17] = 0x00  # Timer 1 CSR
+    regs[0xCC1D] = 0x00  # Timer 2 CSR
+    regs[0xCC23] = 0x00  # Timer 3 CSR
+    regs[0xCC33] = 0x04  # CPU exec status
+    regs[0xCC37] = 0x00  # CPU control
+    regs[0xCC3B] = 0x00  # CPU control 2
+    regs[0xCC3D] = 0x00  # CPU control 3
+    regs[0xCC3E] = 0x00  # CPU control 4
+    regs[0xCC3F] = 0x00  # CPU control 5
+    regs[0xCC81] = 0x00  # Timer/DMA control
+    regs[0xCC82] = 0x00  # Timer/DMA address low
+    regs[0xCC83] = 0x00  # Timer/DMA address high
+    regs[0xCC89] = 0x00  # Timer/DMA status - bit 1 = complete
+    regs[0xCD31] = 0x01  # PHY init status - bit 0 = ready
+
+    # ============================================
+    # SCSI/DMA Registers (0xCExx)
+    # ============================================
+    regs[0xCE00] = 0x03  # SCSI DMA control - in progress until polled
+    regs[0xCE5D] = 0xFF  # Debug enable mask - all levels enabled
+    regs[0xCE89] = 0x01  # SCSI DMA status - bit 0 = ready
+
+    # NOTE: 0x707x addresses are NOT hardware registers!
+    # They are flash buffer RAM (0x7000-0x7FFF) loaded from flash config.
+    # Flash buffer is handled as regular XDATA, not MMIO.
+
+    # ============================================
+    # Debug/Command Engine Registers (0xE4xx)
+    # ============================================
+    regs[0xE40F] = 0x00  # PD event type (for debug output)
+    regs[0xE410] = 0x00  # PD sub-event (for debug output)
+    regs[0xE41C] = 0x00  # Command engine status
+
+    # ============================================
+    # System Status Registers (0xE7xx)
+    # ============================================
+    regs[0xE710] = 0x00  # System status
+    regs[0xE712] = 0x00  # USB EP0 transfer status (bits 0,1 = complete)
+    regs[0xE717] = 0x00  # System status 2
+    regs[0xE751] = 0x00  # System status 3
+    regs[0xE764] = 0x00  # System status 4
+    regs[0xE795] = 0x21  # Flash ready + USB state 3 flag (bit 5)
+    regs[0xE7E3] = 0x80  # PHY link ready
+
+    # ============================================
+    # PHY Completion / Debug Registers (0xE3xx)
+    # ============================================
+    regs[0xE302] = 0x40  # PHY completion status - bit 6 = complete
+
+    return bytes(regs)
+
+
+# Template copied into every HardwareState.regs (one memcpy per instance)
+REGISTER_DEFAULTS = _register_defaults()
+
+# Registers with inline read/write behaviour: (addr, read mode, write mode).
+# Initial values come from REGISTER_DEFAULTS, which is also what READ_FIXED
+# registers always return.
+REGISTER_MODES = (
+    (0xC8A9, READ_FIXED, WRITE_PLAIN),                # Flash CSR - always idle (bit 0 busy clear)
+    (0xC8B8, READ_AUTO_CLEAR_BIT0, WRITE_PLAIN),      # Flash/DMA busy
+    (0xC8D6, READ_FIXED, WRITE_PLAIN),                # DMA status - done
+    (0xCC11, READ_AUTO_SET_BIT1, WRITE_TIMER_CSR),    # Timer 0 CSR - bit 1 = ready/complete
+    (0xCC17, READ_AUTO_SET_BIT1, WRITE_TIMER_CSR),    # Timer 1 CSR
+    (0xCC1D, READ_AUTO_SET_BIT1, WRITE_TIMER_CSR),    # Timer 2 CSR
+    (0xCC23, READ_AUTO_SET_BIT1, WRITE_TIMER_CSR),    # Timer 3 CSR
+    (0xCC89, READ_AUTO_SET_BIT1, WRITE_PLAIN),        # Timer/DMA status - bit 1 = complete
+    (0xCD31, READ_FIXED, WRITE_PLAIN),                # PHY init status - always ready (writes: _phy_cmd_write)
+    (0xE41C, READ_AUTO_CLEAR_BIT0, WRITE_PLAIN),      # Command engine status
+)
+
+
+def _mode_tables():
+    """Compile REGISTER_MODES into per-address read/write mode templates."""
+    read_modes = bytearray(0x10000)
+    write_modes = bytearray(0x10000)
+    for addr, read_mode, write_mode in REGISTER_MODES:
+        read_modes[addr] = read_mode
+        write_modes[addr] = write_mode
+    return bytes(read_modes), bytes(write_modes)
+
+
+READ_MODES, WRITE_MODES = _mode_tables()
+
 @dataclass
 class HardwareState:
     """
@@ -802,6 +1039,7 @@ class HardwareState:
     log_writes: bool = False
     log_uart: bool = True
     log_pcie: bool = True  # Log PCIe DMA operations
+    log_events: bool = True  # Log timed USB plug-in/command-injection events
 
     # Proxy mode - when True, disable all fake USB/interrupt injection
     # Real hardware handles everything, we just proxy MMIO
@@ -823,14 +1061,19 @@ class HardwareState:
     usb_connect_delay: int = 500000  # Cycles before USB plug-in event (after init)
 
     # Polling counters - track how many times an address is polled
-    poll_counts: Dict[int, int] = field(default_factory=dict)
+    poll_counts: PollCounts = field(default_factory=PollCounts)
 
     # Register values - only for hardware registers >= 0x6000
-    regs: Dict[int, int] = field(default_factory=dict)
+    regs: RegisterFile = field(default_factory=RegisterFile)
 
     # Callbacks for specific addresses
-    read_callbacks: Dict[int, Callable[['HardwareState', int], int]] = field(default_factory=dict)
-    write_callbacks: Dict[int, Callable[['HardwareState', int, int], None]] = field(default_factory=dict)
+    read_callbacks: CallbackTable = field(default_factory=CallbackTable)
+    write_callbacks: CallbackTable = field(default_factory=CallbackTable)
+
+    # Per-address READ_* mode for callback-free registers, applied inline by read()
+    read_mode: bytearray = field(default_factory=lambda: bytearray(READ_MODES))
+    # Per-address WRITE_* mode for callback-free registers, applied inline by write()
+    write_mode: bytearray = field(default_factory=lambda: bytearray(WRITE_MODES))
 
     # USB command queue
     usb_cmd_queue: list = field(default_factory=list)
@@ -933,158 +1176,42 @@ class HardwareState:
     xdata_trace_addrs: Dict[int, str] = field(default_factory=dict)  # addr -> name
     xdata_write_log: list = field(default_factory=list)  # Log of traced writes
 
+    # Internal state set by the emulator, USBController and USB host/device
+    # glue. Declared up front (rather than created on first use behind
+    # hasattr/getattr checks) so every instance has the same attribute layout.
+    _cpu_ref: 'CPU8051' = None  # Set by Emulator for PC lookups in tracing
+    _usb_interrupt_armed: bool = False  # Backing store for _pending_usb_interrupt
+    _e5_dma_done: bool = False  # E5 write DMA already performed
+    _pcie_read_count: int = 0  # 0xB296 polls
+    _c4ec_read_count: int = 0  # 0xC4EC polls while a USB command is pending
+    _usb_9091_read_count: int = 0  # 0x9091 polls
+    _usb_9091_setup_writes: int = 0  # 0x01 writes to 0x9091 (setup phase)
+    _usb_config_captured_offsets: Set[int] = field(default_factory=set)  # Captured config desc bytes
+
+    # tick() only evaluates its timed events once cycles reach this value;
+    # see _schedule_next_event()
+    _next_event: int = 0
+    # Cycle count at which the periodic timer interrupt is next raised
+    _next_timer_irq: int = TIMER_IRQ_PERIOD
+
+    @property
+    def _pending_usb_interrupt(self) -> bool:
+        """Raise EX0 on the next tick()."""
+        return self._usb_interrupt_armed
+
+    @_pending_usb_interrupt.setter
+    def _pending_usb_interrupt(self, value: bool):
+        # Arming pulls the next event in, so tick() needs no per-call flag check
+        self._usb_interrupt_armed = value
+        if value:
+            self._next_event = 0
+
     def __post_init__(self):
-        """Initialize hardware register defaults."""
-        self._init_registers()
+        """Install register callbacks (regs starts from REGISTER_DEFAULTS)."""
         self._setup_callbacks()
         # Create USB controller after self is initialized
         self.usb_controller = USBController(self)
 
-    def _init_registers(self):
-        """
-        Set default values for hardware registers.
-        Only addresses >= 0x6000 are hardware registers.
-        """
-        # ============================================
-        # USB Controller Registers (0x9xxx)
-        # ============================================
-        self.regs[0x9000] = 0x00  # USB status - bit 7 = connected
-        self.regs[0x90E0] = 0x00  # USB speed
-        self.regs[0x9100] = 0x00  # USB link status
-        self.regs[0x9105] = 0x00  # USB PHY status
-        self.regs[0x91C0] = 0x02  # USB PHY control
-        self.regs[0x91D0] = 0x00  # USB PHY config
-
-        # ============================================
-        # Power Management Registers (0x92xx)
-        # ============================================
-        self.regs[0x92C0] = 0x81  # Power enable
-        self.regs[0x92C1] = 0x03  # Clocks enabled
-        self.regs[0x92C2] = 0x40  # Power state - bit 6 enables PD task path at 0xBF44
-        self.regs[0x92C5] = 0x04  # PHY powered
-        self.regs[0x92E0] = 0x02  # Power domain
-        self.regs[0x92F7] = 0x40  # Power status
-        self.regs[0x92FB] = 0x01  # Power sequence complete (checked at 0x9C42)
-
-        # ============================================
-        # PD Event Registers (0xE4xx)
-        # ============================================
-        # These control the debug output at 0xAE89/0xAF5E
-        # Set initial PD event to trigger debug output
-        self.regs[0xE40F] = 0x00  # PD event type - will be set during PD events
-        self.regs[0xE410] = 0x00  # PD sub-event
-
-        # ============================================
-        # PCIe Registers (0xBxxx)
-        # ============================================
-        self.regs[0xB238] = 0x00  # PCIe trigger - not busy
-        self.regs[0xB254] = 0x00  # PCIe trigger write
-        self.regs[0xB296] = 0x00  # PCIe status - bit 2 set when DMA complete
-        self.regs[0xB401] = 0x01  # PCIe tunnel enabled
-        self.regs[0xB480] = 0x00  # PCIe link initially down (bit 0 = 0)
-        # This allows USB state machine to return R7=5 at 0x3FC6 instead of state=11
-
-        # ============================================
-        # UART Registers (0xC0xx)
-        # ============================================
-        self.regs[0xC000] = 0x00  # UART TX data
-        self.regs[0xC001] = 0x00  # UART TX data (alt)
-        self.regs[0xC009] = 0x60  # UART LSR - TX empty, ready
-
-        # ============================================
-        # NVMe Controller Registers (0xC4xx, 0xC5xx)
-        # ============================================
-        self.regs[0xC412] = 0x02  # NVMe ready
-        self.regs[0xC471] = 0x00  # NVMe queue busy - bit 0 = queue busy
-        self.regs[0xC47A] = 0x00  # NVMe command status
-        self.regs[0xC520] = 0x80  # NVMe link ready
-
-        # ============================================
-        # PHY Registers (0xC6xx)
-        # ============================================
-        self.regs[0xC620] = 0x00  # PHY control
-        self.regs[0xC655] = 0x08  # PHY config
-        self.regs[0xC65A] = 0x09  # PHY config
-        self.regs[0xC6B3] = 0x30  # PHY status - bits 4,5 set
-
-        # ============================================
-        # Interrupt/DMA/Flash Registers (0xC8xx)
-        # ============================================
-        self.regs[0xC800] = 0x00  # Interrupt status
-        self.regs[0xC802] = 0x00  # Interrupt status 2
-        self.regs[0xC806] = 0x00  # System interrupt status
-        self.regs[0xC80A] = 0x00  # PCIe/NVMe interrupt - bit 6 triggers PD debug
-        self.regs[0xC8A9] = 0x00  # Flash CSR - not busy
-        self.regs[0xC8AA] = 0x00  # Flash command
-        self.regs[0xC8AB] = 0x00  # Flash address high
-        self.regs[0xC8AC] = 0x00  # Flash address mid
-        self.regs[0xC8AD] = 0x00  # Flash address low
-        self.regs[0xC8AE] = 0x00  # Flash data register
-        self.regs[0xC8B8] = 0x00  # Flash/DMA status
-        self.regs[0xC8D6] = 0x04  # DMA status - done
-
-        # ============================================
-        # USB Power Delivery (PD) Registers (0xCAxx)
-        # ============================================
-        self.regs[0xCA00] = 0x00  # PD control
-        self.regs[0xCA06] = 0x00  # PD status
-        self.regs[0xCA0A] = 0x00  # PD interrupt control
-        self.regs[0xCA0D] = 0x00  # PD interrupt status 1 - bit 3 = interrupt pending
-        self.regs[0xCA0E] = 0x00  # PD interrupt status 2 - bit 2 = interrupt pending
-        self.regs[0xCA81] = 0x00  # PD extended status
-
-        # ============================================
-        # Timer/CPU Control Registers (0xCCxx, 0xCDxx)
-        # ============================================
-        self.regs[0xCC11] = 0x00  # Timer 0 CSR
-        self.regs[0xCC17] = 0x00  # Timer 1 CSR
-        self.regs[0xCC1D] = 0x00  # Timer 2 CSR
-        self.regs[0xCC23] = 0x00  # Timer 3 CSR
-        self.regs[0xCC33] = 0x04  # CPU exec status
-        self.regs[0xCC37] = 0x00  # CPU control
-        self.regs[0xCC3B] = 0x00  # CPU control 2
-        self.regs[0xCC3D] = 0x00  # CPU control 3
-        self.regs[0xCC3E] = 0x00  # CPU control 4
-        self.regs[0xCC3F] = 0x00  # CPU control 5
-        self.regs[0xCC81] = 0x00  # Timer/DMA control
-        self.regs[0xCC82] = 0x00  # Timer/DMA address low
-        self.regs[0xCC83] = 0x00  # Timer/DMA address high
-        self.regs[0xCC89] = 0x00  # Timer/DMA status - bit 1 = complete
-        self.regs[0xCD31] = 0x01  # PHY init status - bit 0 = ready
-
-        # ============================================
-        # SCSI/DMA Registers (0xCExx)
-        # ============================================
-        self.regs[0xCE5D] = 0xFF  # Debug enable mask - all levels enabled
-        self.regs[0xCE89] = 0x01  # SCSI DMA status - bit 0 = ready
-
-        # NOTE: 0x707x addresses are NOT hardware registers!
-        # They are flash buffer RAM (0x7000-0x7FFF) loaded from flash config.
-        # Flash buffer is handled as regular XDATA, not MMIO.
-
-        # ============================================
-        # Debug/Command Engine Registers (0xE4xx)
-        # ============================================
-        self.regs[0xE40F] = 0x00  # PD event type (for debug output)
-        self.regs[0xE410] = 0x00  # PD sub-event (for debug output)
-        self.regs[0xE41C] = 0x00  # Command engine status
-
-        # ============================================
-        # System Status Registers (0xE7xx)
-        # ============================================
-        self.regs[0xE710] = 0x00  # System status
-        self.regs[0xE712] = 0x00  # USB EP0 transfer status (bits 0,1 = complete)
-        self.regs[0xE717] = 0x00  # System status 2
-        self.regs[0xE751] = 0x00  # System status 3
-        self.regs[0xE764] = 0x00  # System status 4
-        self.regs[0xE795] = 0x21  # Flash ready + USB state 3 flag (bit 5)
-        self.regs[0xE7E3] = 0x80  # PHY link ready
-
-        # ============================================
-        # PHY Completion / Debug Registers (0xE3xx)
-        # ============================================
-        self.regs[0xE302] = 0x40  # PHY completion status - bit 6 = complete
-
     def _setup_callbacks(self):
         """Setup read/write callbacks for hardware with special behavior."""
         # UART TX - capture output
@@ -1098,42 +1225,23 @@ class HardwareState:
         # PCIe DMA trigger - E4/E5 command DMA
         self.write_callbacks[0xB296] = self._pcie_dma_trigger
 
-        # Flash CSR - auto-complete
-        self.read_callbacks[0xC8A9] = self._flash_csr_read
+        # Flash CSR status (0xC8A9), DMA status (0xC8D6), Flash/DMA busy (0xC8B8),
+        # timer CSRs, 0xCC89, PHY init status (0xCD31) reads and command engine
+        # status (0xE41C) are handled inline; see REGISTER_MODES
+
+        # Flash command
         self.write_callbacks[0xC8AA] = self._flash_cmd_write
 
         # Flash data register - read/write actual flash data
         self.read_callbacks[0xC8AE] = self._flash_data_read
         self.write_callbacks[0xC8AE] = self._flash_data_write
 
-        # DMA status
-        self.read_callbacks[0xC8D6] = self._dma_status_read
-
-        # Flash/DMA busy - auto-clear
-        self.read_callbacks[0xC8B8] = self._busy_reg_read
-
         # System interrupt status - clear on read
         self.read_callbacks[0xC806] = self._int_status_read
 
-        # Timer CSRs
-        for addr in [0xCC11, 0xCC17, 0xCC1D, 0xCC23]:
-            self.read_callbacks[addr] = self._timer_csr_read
-            self.write_callbacks[addr] = self._timer_csr_write
-
-        # Timer/DMA status register (0xCC89) - set complete bit after polling
-        self.read_callbacks[0xCC89] = self._timer_dma_status_read
-
-        # PHY init status - also handles descriptor DMA trigger on write
-        self.read_callbacks[0xCD31] = self._phy_status_read
+        # PHY init status write - also handles descriptor DMA trigger
         self.write_callbacks[0xCD31] = self._phy_cmd_write
 
-        # Command engine status
-        self.read_callbacks[0xE41C] = self._cmd_engine_read
-
-        # PD interrupt status - set by USB PD events
-        self.read_callbacks[0xCA0D] = self._pd_interrupt_read
-        self.read_callbacks[0xCA0E] = self._pd_interrupt_read
-
         # USB state machine MMIO registers (see registers.h for definitions)
         # REG_USB_DMA_STATE (0xCE89): USB/DMA status - controls state transitions
         #   USB_DMA_STATE_READY (bit 0): Must be set to exit wait loop (0x348C)
@@ -1397,7 +1505,7 @@ class HardwareState:
             elif 0x20 <= value < 0x7F:  # Printable ASCII
                 self.uart_buffer += chr(value)
                 # Flush on ']' to show complete [message] blocks
-                if chr(value) == ']':
+                if value == 0x5D:
                     print(f"[{self.cycles:8d}] [UART] {self.uart_buffer}")
                     self.uart_buffer = ""
             # For very long lines, flush periodically
@@ -1405,9 +1513,14 @@ class HardwareState:
                 print(f"[{self.cycles:8d}] [UART] {self.uart_buffer}")
                 self.uart_buffer = ""
         else:
+            # Raw mode: no per-byte flush; flush once per line so output still
+            # shows up promptly when stdout is a pipe/file or block buffered
             try:
-                if 0x20 <= value < 0x7F or value in (0x0A, 0x0D):
-                    print(chr(value), end='', flush=True)
+                if 0x20 <= value < 0x7F or value == 0x0D:
+                    sys.stdout.write(chr(value))
+                elif value == 0x0A:
+                    sys.stdout.write('\n')
+                    sys.stdout.flush()
             except:
                 pass
 
@@ -1423,12 +1536,10 @@ class HardwareState:
         Return value with both bits set after polling.
         """
         # Count reads and set completion bits after some polls
-        if not hasattr(self, '_pcie_read_count'):
-            self._pcie_read_count = 0
         self._pcie_read_count += 1
 
         # Return current value with completion bits OR'd in after 5 reads
-        value = self.regs.get(addr, 0x00)
+        value = self.regs[addr]
         if self._pcie_read_count >= 5:
             value |= 0x06  # Set bits 1 and 2
         return value
@@ -1454,9 +1565,9 @@ class HardwareState:
         # Value 0x08 is the E4/E5 DMA trigger
         if value == 0x08:
             # Get target address from CDB (big-endian: 0x910F=high, 0x9110=mid, 0x9111=low)
-            addr_high = self.regs.get(0x910F, 0)
-            addr_mid = self.regs.get(0x9110, 0)
-            addr_low = self.regs.get(0x9111, 0)
+            addr_high = self.regs[0x910F]
+            addr_mid = self.regs[0x9110]
+            addr_low = self.regs[0x9111]
             target_addr = (addr_high << 16) | (addr_mid << 8) | addr_low
 
             # Check command type to determine operation
@@ -1464,7 +1575,7 @@ class HardwareState:
 
             if cmd_type == 0xE5:
                 # E5 WRITE: Write single byte from CDB to XDATA
-                write_value = self.regs.get(0x910E, 0)
+                write_value = self.regs[0x910E]
                 xdata_addr = target_addr & 0xFFFF
 
                 if self.log_pcie:
@@ -1484,7 +1595,7 @@ class HardwareState:
 
             else:
                 # E4 READ: Copy from XDATA to USB buffer
-                size = self.regs.get(0x910E, 0)
+                size = self.regs[0x910E]
 
                 if self.log_pcie:
                     print(f"[{self.cycles:8d}] [PCIe] DMA TRIGGER: src=0x{target_addr:06X} size={size}")
@@ -1555,14 +1666,6 @@ class HardwareState:
     # ============================================
     # Flash/DMA Callbacks
     # ============================================
-    def _flash_csr_read(self, hw: 'HardwareState', addr: int) -> int:
-        """
-        Flash CSR read - returns status.
-        Bit 0: Busy (0 = idle, 1 = operation in progress)
-        """
-        # Flash is always ready (operations complete instantly in emulation)
-        return 0x00
-
     def _flash_cmd_write(self, hw: 'HardwareState', addr: int, value: int):
         """
         Flash command write - triggers flash operations.
@@ -1577,9 +1680,9 @@ class HardwareState:
         - 0x04: Write disable
         """
         # Get flash address from address registers
-        addr_hi = self.regs.get(0xC8AB, 0)
-        addr_mid = self.regs.get(0xC8AC, 0)
-        addr_lo = self.regs.get(0xC8AD, 0)
+        addr_hi = self.regs[0xC8AB]
+        addr_mid = self.regs[0xC8AC]
+        addr_lo = self.regs[0xC8AD]
         flash_addr = (addr_hi << 16) | (addr_mid << 8) | addr_lo
         self.spi_flash_addr = flash_addr
 
@@ -1663,19 +1766,6 @@ class HardwareState:
         except Exception as e:
             print(f"[SPI_FLASH] Failed to save to {path}: {e}")
 
-    def _dma_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """DMA status - done."""
-        return 0x04
-
-    def _busy_reg_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Busy register - auto-clear after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        if count >= 3 and (value & 0x01):
-            value &= ~0x01
-            self.regs[addr] = value
-        return value
-
     def _flash_rom_mirror_read(self, hw: 'HardwareState', addr: int) -> int:
         """
         Flash/Code ROM mirror read.
@@ -1699,15 +1789,11 @@ class HardwareState:
     # ============================================
     def _int_status_read(self, hw: 'HardwareState', addr: int) -> int:
         """System interrupt status - clear on read."""
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
         if value & 0x01:
             self.regs[addr] = value & ~0x01
         return value
 
-    def _pd_interrupt_read(self, hw: 'HardwareState', addr: int) -> int:
-        """PD interrupt status - returns current state."""
-        return self.regs.get(addr, 0)
-
     # ============================================
     # USB State Machine MMIO Callbacks
     # ============================================
@@ -1764,7 +1850,7 @@ class HardwareState:
         if self.log_reads or self.usb_cmd_pending:
             # Add PC for better tracing
             pc = 0
-            if hasattr(self, '_cpu_ref') and self._cpu_ref:
+            if self._cpu_ref:
                 pc = self._cpu_ref.pc
             print(f"[{self.cycles:8d}] [USB_SM] Read 0xCE89 = 0x{value:02X} (count={self.usb_ce89_read_count}, PC=0x{pc:04X})")
 
@@ -1837,7 +1923,7 @@ class HardwareState:
         # Return 0 after a few reads to simulate DMA completion
         if self.usb_ce00_read_count >= 2:
             return 0x00  # DMA complete
-        return self.regs.get(0xCE00, 0x03)  # DMA in progress
+        return self.regs[0xCE00]  # DMA in progress
 
     def _usb_ce00_write(self, hw: 'HardwareState', addr: int, value: int):
         """
@@ -1874,45 +1960,9 @@ class HardwareState:
         if self.log_writes:
             print(f"[{self.cycles:8d}] [USB_HW] CE88 write = 0x{value:02X}, reset CE89 counter")
 
-    # ============================================
-    # Timer Callbacks
-    # ============================================
-    def _timer_csr_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Timer CSR - auto-set ready bit after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        # The firmware polls for bit 1 (0x02) to be set - indicating timer ready/complete
-        # Set bit 1 after a few polls to avoid infinite wait
-        if count >= 2:
-            value |= 0x02  # Set ready/complete bit
-            self.regs[addr] = value
-        return value
-
-    def _timer_csr_write(self, hw: 'HardwareState', addr: int, value: int):
-        """Timer CSR write."""
-        if value & 0x04:  # Clear flag
-            value &= ~0x02
-        self.regs[addr] = value
-        self.poll_counts[addr] = 0
-
-    def _timer_dma_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Timer/DMA status (0xCC89) - set complete bit after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        # The firmware polls for bit 1 (0x02) to be set - indicating DMA complete
-        if count >= 2:
-            value |= 0x02  # Set complete bit
-            self.regs[addr] = value
-        return value
-
     # ============================================
     # PHY/CPU Callbacks
     # ============================================
-    def _phy_status_read(self, hw: 'HardwareState', addr: int) -> int:
-        """PHY status - bit 0 = ready, bit 1 = busy."""
-        # Return ready state: bit 0 set, bit 1 clear
-        return 0x01
-
     def _phy_cmd_write(self, hw: 'HardwareState', addr: int, value: int):
         """
         PHY command register write (0xCD31).
@@ -1923,15 +1973,6 @@ class HardwareState:
         """
         self.regs[addr] = value
 
-    def _cmd_engine_read(self, hw: 'HardwareState', addr: int) -> int:
-        """Command engine - auto-clear bit 0 after polling."""
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
-        if count >= 3 and (value & 0x01):
-            value &= ~0x01
-            self.regs[addr] = value
-        return value
-
     # ============================================
     # USB Command Injection
     # ============================================
@@ -2169,10 +2210,6 @@ class HardwareState:
         self.regs[addr] = value
         offset = addr - 0x9E00
 
-        # Track which bytes have been captured (to ignore later overwrites)
-        if not hasattr(self, '_usb_config_captured_offsets'):
-            self._usb_config_captured_offsets = set()
-
         # Check for start of config descriptor (bLength=0x09, bDescriptorType=0x02)
         if offset == 0 and value == 0x09:
             # Might be config descriptor - start capturing
@@ -2308,7 +2345,7 @@ class HardwareState:
         or USB3 config (0x58CF) for SuperSpeed with 1024-byte endpoints.
         """
         # Check USB speed from controller
-        usb_ctrl = getattr(self, 'usb_controller', None)
+        usb_ctrl = self.usb_controller
         usb_speed = getattr(usb_ctrl, 'usb_speed', 2) if usb_ctrl else 2
 
         # USB 2.0 High Speed (speed < 2) uses USB2 config descriptor
@@ -2349,8 +2386,8 @@ class HardwareState:
         indicating the USB EP0 control transfer is complete.
         This happens after calling 0xE581 which initiates the DMA transfer.
         """
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
+        count = self.poll_counts[addr]
+        value = self.regs[addr]
         # After a few polls, set both bits to indicate transfer complete
         if count >= 2:
             value |= 0x03  # Set bits 0 and 1 (transfer complete)
@@ -2370,7 +2407,7 @@ class HardwareState:
         """
         if self.usb_connected:
             return 0x02  # Bit 1 SET - enables USB state machine progress
-        return self.regs.get(addr, 0)
+        return self.regs[addr]
 
     def _usb_92c2_read(self, hw: 'HardwareState', addr: int) -> int:
         """
@@ -2393,7 +2430,7 @@ class HardwareState:
             # ALWAYS return bit 6 SET during control transfers to prevent
             # the state reset at 0xBDA4 from clearing 0x0AF7
             return 0x40
-        return self.regs.get(addr, 0x40)  # Default: bit 6 SET (PD task enabled)
+        return self.regs[addr]  # Default: bit 6 SET (PD task enabled, seeded at init)
 
     def _usb_ep0_fifo_write(self, hw: 'HardwareState', addr: int, value: int):
         """
@@ -2426,22 +2463,22 @@ class HardwareState:
             # We DMA from the firmware-specified address to USB buffer at 0x8000
 
             # Read DMA source address from firmware-configured registers
-            dma_addr_hi = self.regs.get(0x905B, 0)
-            dma_addr_lo = self.regs.get(0x905C, 0)
+            dma_addr_hi = self.regs[0x905B]
+            dma_addr_lo = self.regs[0x905C]
             dma_src_addr = (dma_addr_hi << 8) | dma_addr_lo
 
             # Read transfer length from firmware-configured register
-            dma_len = self.regs.get(0x9004, 0)
+            dma_len = self.regs[0x9004]
             if dma_len == 0:
                 # Fallback: use stored wLength from pending descriptor request
                 # (can't read from 0x9E06-0x9E07 because firmware overwrote with descriptor data)
-                usb_ctrl = getattr(self, 'usb_controller', None)
+                usb_ctrl = self.usb_controller
                 if usb_ctrl and usb_ctrl.pending_descriptor_request:
                     dma_len = usb_ctrl.pending_descriptor_request.get('length', 64)
                 else:
                     # Last resort: read bLength from first byte of descriptor at 0x9E00
                     # This works for single descriptors like device/string
-                    bLength = self.regs.get(0x9E00, 0)
+                    bLength = self.regs[0x9E00]
                     if 2 <= bLength <= 255:
                         dma_len = bLength
                     else:
@@ -2458,7 +2495,7 @@ class HardwareState:
             elif dma_src_addr == 0 and dma_len > 0:
                 # Firmware set src to 0 - DMA from EP0 buffer at 0x9E00 where firmware wrote data
                 # Check if we have captured config descriptor (firmware writes it but then corrupts)
-                usb_ctrl = getattr(self, 'usb_controller', None)
+                usb_ctrl = self.usb_controller
                 desc_type = None
                 if usb_ctrl and usb_ctrl.pending_descriptor_request:
                     desc_type = usb_ctrl.pending_descriptor_request.get('type', None)
@@ -2470,7 +2507,7 @@ class HardwareState:
                     print(f"[{self.cycles:8d}] [USB] Using captured config descriptor ({dma_len} bytes)")
                 else:
                     # Use current 0x9E00 buffer content
-                    desc_data = bytes([self.regs.get(0x9E00 + i, 0) for i in range(dma_len)])
+                    desc_data = bytes(self.regs[0x9E00:0x9E00 + dma_len])
 
                 for i, b in enumerate(desc_data):
                     self.memory.xdata[0x8000 + i] = b
@@ -2483,8 +2520,8 @@ class HardwareState:
 
         elif value == 0x04:
             # DMA trigger - read length from 0x9003-0x9004
-            len_lo = self.regs.get(0x9003, 0)
-            len_hi = self.regs.get(0x9004, 0)
+            len_lo = self.regs[0x9003]
+            len_hi = self.regs[0x9004]
             length = (len_hi << 8) | len_lo
 
             print(f"[{self.cycles:8d}] [USB] EP0 DMA trigger: length={length}, FIFO has {len(self.usb_ep0_fifo)} bytes")
@@ -2515,8 +2552,8 @@ class HardwareState:
         After the initial write of 0x04, the hardware will clear bit 2
         when the transfer is done.
         """
-        count = self.poll_counts.get(addr, 0)
-        value = self.regs.get(addr, 0)
+        count = self.poll_counts[addr]
+        value = self.regs[addr]
 
         # After a few polls, clear bit 2 (DMA complete)
         if count >= 2 and (value & 0x04):
@@ -2537,16 +2574,15 @@ class HardwareState:
         The firmware loops at 0xA5E2-0xA60B writing 0x01 and waiting for bit 0 to clear.
         When bit 0 clears and bit 1 is set, 0xD088 is called for DMA response.
         """
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # Track read count for phase transition
-        count = getattr(self, '_usb_9091_read_count', 0)
-        self._usb_9091_read_count = count + 1
+        self._usb_9091_read_count += 1
 
         # Phase transition: after setup handler has processed the request,
         # clear bit 0 and set bit 1 to trigger data phase
         # The setup handler writes 0x01 repeatedly, so we detect that pattern
-        if getattr(self, '_usb_9091_setup_writes', 0) >= 3 and (value & 0x01):
+        if self._usb_9091_setup_writes >= 3 and (value & 0x01):
             value = 0x02  # Clear bit 0, set bit 1 for data phase
             self.regs[addr] = value
             self._usb_9091_setup_writes = 0  # Reset for next transfer
@@ -2566,7 +2602,7 @@ class HardwareState:
 
         # Count writes of 0x01 (setup phase polling)
         if value == 0x01:
-            count = getattr(self, '_usb_9091_setup_writes', 0)
+            count = self._usb_9091_setup_writes
             self._usb_9091_setup_writes = count + 1
             if self.log_writes:
                 print(f"[{self.cycles:8d}] [USB] 0x9091 write 0x01 (setup poll #{count + 1})")
@@ -2579,7 +2615,7 @@ class HardwareState:
         After reading, hardware clears bit 6 (acknowledge behavior).
         This allows the main loop at 0xD83B to proceed after the interrupt dispatch.
         """
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # Clear bit 6 after reading (hardware acknowledge)
         if value & 0x40:
@@ -2604,13 +2640,13 @@ class HardwareState:
             print(f"[{self.cycles:8d}] [USB] EP0 armed (9301=0x{value:02X})")
 
             # Log the request type for debugging (but don't process it!)
-            bmRequestType = self.regs.get(0x9E00, 0)
-            bRequest = self.regs.get(0x9E01, 0)
+            bmRequestType = self.regs[0x9E00]
+            bRequest = self.regs[0x9E01]
 
             if bmRequestType == 0x80 and bRequest == 0x06:  # GET_DESCRIPTOR
-                desc_type = self.regs.get(0x9E03, 0)
-                desc_index = self.regs.get(0x9E02, 0)
-                wLength = self.regs.get(0x9E06, 0) | (self.regs.get(0x9E07, 0) << 8)
+                desc_type = self.regs[0x9E03]
+                desc_index = self.regs[0x9E02]
+                wLength = self.regs[0x9E06] | (self.regs[0x9E07] << 8)
                 print(f"[{self.cycles:8d}] [USB] GET_DESCRIPTOR: type=0x{desc_type:02X} "
                       f"index={desc_index} len={wLength} (firmware will handle via DMA)")
                 # NOTE: The emulator does NOT populate the buffer here!
@@ -2620,7 +2656,7 @@ class HardwareState:
             # Mark control transfer completion status
             # - IN transfers (bit 7 set): Stay active until DMA completes (at 0x9092 write)
             # - OUT transfers (bit 7 clear): Complete when EP0 armed for status stage
-            wLength = self.regs.get(0x9E06, 0) | (self.regs.get(0x9E07, 0) << 8)
+            wLength = self.regs[0x9E06] | (self.regs[0x9E07] << 8)
             if bmRequestType & 0x80:
                 # IN transfer (GET_DESCRIPTOR etc.) - stay active until DMA completes
                 # The flag will be cleared by _usb_ep0_dma_trigger_write when DMA finishes
@@ -2697,13 +2733,13 @@ class HardwareState:
         # DMA trigger at D800
         if addr == 0xD800 and value in (0x03, 0x04):
             # Get source address from registers firmware wrote
-            src_hi = self.regs.get(0x905B, 0)
-            src_lo = self.regs.get(0x905C, 0)
+            src_hi = self.regs[0x905B]
+            src_lo = self.regs[0x905C]
             src_addr = (src_hi << 8) | src_lo
 
             if src_addr > 0 and self.memory:
                 # Get transfer length from D807 or use default
-                xfer_len = self.regs.get(0xD807, 0)
+                xfer_len = self.regs[0xD807]
                 if xfer_len == 0:
                     xfer_len = 64  # Default EP0 max packet size
 
@@ -2720,10 +2756,10 @@ class HardwareState:
 
         # E5 write DMA (uses different address registers)
         if addr == 0xD800 and value == 0x04 and self.usb_cmd_type == 0xE5:
-            if not getattr(self, '_e5_dma_done', False):
-                data = self.regs.get(0xC4E8, 0)
-                addr_hi = self.regs.get(0xC4EA, 0)
-                addr_lo = self.regs.get(0xC4EB, 0)
+            if not self._e5_dma_done:
+                data = self.regs[0xC4E8]
+                addr_hi = self.regs[0xC4EA]
+                addr_lo = self.regs[0xC4EB]
                 target_addr = (addr_hi << 8) | addr_lo
 
                 if data != 0xFF and target_addr > 0:
@@ -2738,8 +2774,9 @@ class HardwareState:
     def _read_xdata_for_dma(self, addr: int) -> int:
         """Read from XDATA for DMA, using callbacks if registered."""
         # Check for callback (e.g., flash mirror)
-        if addr in self.read_callbacks:
-            return self.read_callbacks[addr](self, addr)
+        cb = self.read_callbacks[addr]
+        if cb is not None:
+            return cb(self, addr)
         # Direct XDATA read
         if self.memory and addr < len(self.memory.xdata):
             return self.memory.xdata[addr]
@@ -2758,8 +2795,6 @@ class HardwareState:
         """
         # Track EP loop iterations
         if self.usb_cmd_pending:
-            if not hasattr(self, '_c4ec_read_count'):
-                self._c4ec_read_count = 0
             self._c4ec_read_count += 1
 
             # For E5 commands, return 0x00 to take the E5 path at 0x18A8
@@ -2781,7 +2816,7 @@ class HardwareState:
             return value
 
         # Normal read when no command pending
-        return self.regs.get(addr, 0x00)
+        return self.regs[addr]
 
     def _usb_ep_index_write(self, hw: 'HardwareState', addr: int, value: int):
         """Write USB EP index register 0xC4ED - selects which endpoint to query."""
@@ -2819,7 +2854,7 @@ class HardwareState:
         Returns bit 0 = 1 when USB command is pending for that endpoint.
         """
         ep_index = addr - 0x90A1  # EP0 is at 0x90A1, EP1 at 0x90A2, etc.
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # When USB command pending and this is the target endpoint, keep bit 0 set
         if self.usb_cmd_pending and ep_index == 0:
@@ -2839,7 +2874,7 @@ class HardwareState:
         For EP index N, bit (N % 8) must be set in register 0x9096 + (N / 8).
         """
         ep_index = addr - 0x9096  # EP0 is at 0x9096, EP1 at 0x9097, etc.
-        value = self.regs.get(addr, 0)
+        value = self.regs[addr]
 
         # When USB command pending and this is EP0, return non-zero to enable command processing
         # The firmware ANDs this value with a bit mask (0x01 for EP0) and checks if non-zero
@@ -2877,7 +2912,7 @@ class HardwareState:
             return value
 
         # Normal read
-        return self.regs.get(addr, 0x00)
+        return self.regs[addr]
 
     def _usb_e5_value_write(self, hw: 'HardwareState', addr: int, value: int):
         """
@@ -2906,19 +2941,30 @@ class HardwareState:
         if addr < 0x6000:
             return 0x00  # Should not be called for RAM
 
-        self.poll_counts[addr] = self.poll_counts.get(addr, 0) + 1
+        count = self.poll_counts[addr] + 1
+        self.poll_counts[addr] = count
 
-        # Debug: trace CE55 reads
-        if addr == 0xCE55:
-            has_callback = addr in self.read_callbacks
-            print(f"[{self.cycles:8d}] [DEBUG] Reading CE55, callback registered: {has_callback}")
-
-        if addr in self.read_callbacks:
-            value = self.read_callbacks[addr](self, addr)
-        elif addr in self.regs:
+        # Plain registers (no callback) are answered straight from regs
+        cb = self.read_callbacks[addr]
+        if cb is None:
             value = self.regs[addr]
+            mode = self.read_mode[addr]
+            if mode == READ_PLAIN:
+                pass
+            elif mode == READ_FIXED:
+                value = REGISTER_DEFAULTS[addr]
+            elif mode == READ_AUTO_CLEAR_BIT0:
+                if value & 0x01 and count >= AUTO_CLEAR_POLLS:
+                    value &= 0xFE
+                    self.regs[addr] = value
+            elif mode == READ_AUTO_SET_BIT1:
+                if count >= AUTO_SET_POLLS:
+                    value |= 0x02
+                    self.regs[addr] = value
+            if not self.log_reads:
+                return value
         else:
-            value = 0x00
+            value = cb(self, addr)
 
         if self.log_reads:
             print(f"[{self.cycles:8d}] [HW] Read  0x{addr:04X} = 0x{value:02X}")
@@ -2937,10 +2983,16 @@ class HardwareState:
         if self.log_writes:
             print(f"[{self.cycles:8d}] [HW] Write 0x{addr:04X} = 0x{value:02X}")
 
-        if addr in self.write_callbacks:
-            self.write_callbacks[addr](self, addr, value)
-        else:
-            self.regs[addr] = value
+        cb = self.write_callbacks[addr]
+        if cb is not None:
+            cb(self, addr, value)
+            return
+
+        if self.write_mode[addr] == WRITE_TIMER_CSR:
+            if value & 0x04:  # Clear flag
+                value &= ~0x02
+            self.poll_counts[addr] = 0
+        self.regs[addr] = value
 
     # ============================================
     # Tick - Advance Hardware State
@@ -2949,6 +3001,40 @@ class HardwareState:
         """Advance hardware state by cycles."""
         self.cycles += cycles
 
+        # Nothing is due before _next_event
+        if self.cycles < self._next_event:
+            return
+        self._tick_events(cpu)
+
+    def reschedule(self):
+        """
+        Make the next tick() re-evaluate all timed events.
+
+        Call after changing usb_connect_delay, usb_inject_cmd or
+        usb_inject_delay once emulation has started.
+        """
+        self._next_event = 0
+
+    def _schedule_next_event(self) -> int:
+        """
+        Earliest cycle count at which a timed event in _tick_events() can fire.
+
+        Events whose threshold has already passed (but are still waiting on
+        another condition) are rechecked on every tick.
+        """
+        now = self.cycles
+        # Periodic timer interrupt
+        next_event = self._next_timer_irq
+        # USB plug-in
+        if not self.usb_connected:
+            next_event = min(next_event, max(self.usb_connect_delay, now) + 1)
+        # USB command injection
+        if self.usb_inject_cmd and not self.usb_injected:
+            next_event = min(next_event, max(self.usb_connect_delay + self.usb_inject_delay, now) + 1)
+        return next_event
+
+    def _tick_events(self, cpu):
+        """Run the timed events that tick() found due."""
         # In proxy mode, skip all fake USB/interrupt injection
         # Real hardware handles everything
         if self.proxy_mode:
@@ -2958,7 +3044,8 @@ class HardwareState:
         # Skip if a USB command is already pending to avoid interfering with it
         if not self.usb_connected and self.cycles > self.usb_connect_delay and not self.usb_cmd_pending:
             self.usb_connected = True
-            print(f"\n[{self.cycles:8d}] [HW] === USB PLUG-IN EVENT ===")
+            if self.log_events:
+                print(f"\n[{self.cycles:8d}] [HW] === USB PLUG-IN EVENT ===")
 
             # Update USB hardware registers via USBController
             self.usb_controller.connect()
@@ -2985,8 +3072,9 @@ class HardwareState:
             self.regs[0xE40F] = 0x01  # PD event type (bit 0 = Source_Cap)
             self.regs[0xE410] = 0x00  # PD sub-event
 
-            print(f"[{self.cycles:8d}] [HW] USB: 0x9000=0x81, C802=0x05, C471=0x01, CA0D=0x0C, E40F=0x01")
-            print(f"[{self.cycles:8d}] [HW] USB state machine: firmware will poll 0xCE89 to transition states")
+            if self.log_events:
+                print(f"[{self.cycles:8d}] [HW] USB: 0x9000=0x81, C802=0x05, C471=0x01, CA0D=0x0C, E40F=0x01")
+                print(f"[{self.cycles:8d}] [HW] USB state machine: firmware will poll 0xCE89 to transition states")
 
             # Trigger External Interrupt 0 to invoke the interrupt handler at 0x0E33
             # This requires IE register (0xA8) to have EA (bit 7) and EX0 (bit 0) set
@@ -2997,11 +3085,14 @@ class HardwareState:
                 if self.memory:
                     self.memory.write_sfr(0xA8, ie)
                 cpu._ext0_pending = True
-                print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt (IE=0x{ie:02X})")
+                if self.log_events:
+                    print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt (IE=0x{ie:02X})")
 
-        # Periodic timer interrupt
-        if self.cycles % 1000 == 0:
+        # Periodic timer interrupt, once per TIMER_IRQ_PERIOD cycles even when
+        # an instruction steps over the exact boundary
+        if self.cycles >= self._next_timer_irq:
             self.regs[0xC806] |= 0x01
+            self._next_timer_irq += TIMER_IRQ_PERIOD
 
         # Inject USB command after USB connected and additional delay
         # Only inject if usb_inject_cmd was set (via --usb-cmd option)
@@ -3009,7 +3100,8 @@ class HardwareState:
             if self.cycles > self.usb_connect_delay + self.usb_inject_delay:
                 self.usb_injected = True
                 cmd_type, addr, val_or_size = self.usb_inject_cmd
-                print(f"\n[{self.cycles:8d}] [HW] === INJECTING USB COMMAND ===")
+                if self.log_events:
+                    print(f"\n[{self.cycles:8d}] [HW] === INJECTING USB COMMAND ===")
                 if cmd_type == 0xE4:
                     self.inject_usb_command(0xE4, addr, size=val_or_size)
                 elif cmd_type == 0xE5:
@@ -3018,16 +3110,39 @@ class HardwareState:
                     print(f"[HW] Unknown USB command type: 0x{cmd_type:02X}")
 
         # Trigger EX0 interrupt after USB command injection
-        if hasattr(self, '_pending_usb_interrupt') and self._pending_usb_interrupt and cpu:
-            self._pending_usb_interrupt = False
+        if self._usb_interrupt_armed and cpu:
+            self._usb_interrupt_armed = False
             # Enable global interrupts (EA) and EX0 in IE register
             ie = self.memory.read_sfr(0xA8) if self.memory else 0
             ie |= 0x81  # EA (bit 7) + EX0 (bit 0)
             if self.memory:
                 self.memory.write_sfr(0xA8, ie)
             cpu._ext0_pending = True
-            print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt for USB command (IE=0x{ie:02X})")
-
+            if self.log_events:
+                print(f"[{self.cycles:8d}] [HW] Triggered EX0 interrupt for USB command (IE=0x{ie:02X})")
+
+        self._next_event = self._schedule_next_event()
+
+
+# Hardware register ranges (all >= 0x6000)
+# NOTE: 0x7000-0x7FFF is flash buffer RAM, NOT hardware registers
+MMIO_RANGES = (
+    (0x8000, 0x9000),   # USB/SCSI Data Buffer
+    (0x9000, 0x9400),   # USB Interface
+    (0x92C0, 0x9300),   # Power Management
+    (0x9E00, 0xA000),   # USB Control Buffer
+    (0xB200, 0xB900),   # PCIe Passthrough
+    (0xC000, 0xC100),   # UART
+    (0xC400, 0xC600),   # NVMe Interface
+    (0xC600, 0xC700),   # PHY Extended
+    (0xC800, 0xC900),   # Interrupt/DMA/Flash
+    (0xCA00, 0xCB00),   # PD Controller
+    (0xCC00, 0xCF00),   # Timer/CPU/SCSI
+    (0xD800, 0xE000),   # USB Endpoint Data Buffer
+    (0xE300, 0xE400),   # PHY Completion / Debug
+    (0xE400, 0xE500),   # Command Engine
+    (0xE700, 0xE800),   # System Status
+)
 
 
 def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy' = None, proxy_mask: list = None):
@@ -3046,26 +3161,6 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy
     if proxy_mask is None:
         proxy_mask = []
 
-    # Hardware register ranges (all >= 0x6000)
-    # NOTE: 0x7000-0x7FFF is flash buffer RAM, NOT hardware registers
-    mmio_ranges = [
-        (0x8000, 0x9000),   # USB/SCSI Data Buffer
-        (0x9000, 0x9400),   # USB Interface
-        (0x92C0, 0x9300),   # Power Management
-        (0x9E00, 0xA000),   # USB Control Buffer
-        (0xB200, 0xB900),   # PCIe Passthrough
-        (0xC000, 0xC100),   # UART
-        (0xC400, 0xC600),   # NVMe Interface
-        (0xC600, 0xC700),   # PHY Extended
-        (0xC800, 0xC900),   # Interrupt/DMA/Flash
-        (0xCA00, 0xCB00),   # PD Controller
-        (0xCC00, 0xCF00),   # Timer/CPU/SCSI
-        (0xD800, 0xE000),   # USB Endpoint Data Buffer
-        (0xE300, 0xE400),   # PHY Completion / Debug
-        (0xE400, 0xE500),   # Command Engine
-        (0xE700, 0xE800),   # System Status
-    ]
-
     # Set memory reference for USB commands
     hw.memory = memory
 
@@ -3081,13 +3176,16 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy
             if hw_ref.xdata_trace_enabled:
                 # Get PC from CPU if available
                 pc = 0
-                if hasattr(hw_ref, '_cpu_ref') and hw_ref._cpu_ref:
+                if hw_ref._cpu_ref:
                     pc = hw_ref._cpu_ref.pc
                 hw_ref.trace_xdata_write(addr, value, pc)
             # Perform actual write
             return original_write(addr, value)
         return hook
 
+    # These forwarders resolve hw_ref.read/write at call time (rather than
+    # installing the bound methods) so instance-level overrides of hw.read and
+    # hw.write, as used by tracing code and tests, still see every access.
     def make_read_hook(hw_ref):
         def hook(addr):
             return hw_ref.read(addr)
@@ -3156,23 +3254,18 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy
         emu_read_hook = make_read_hook(hw)
         emu_write_hook = make_write_hook(hw)
 
-        def should_emulate(addr):
-            """Check if address should be emulated instead of proxied."""
+        # Ranges emulated instead of proxied (end exclusive)
+        emulated_ranges = [
             # UART (0xC000-0xC00F) - proxy uses these for communication
-            if 0xC000 <= addr <= 0xC00F:
-                return True
+            (0xC000, 0xC010),
             # CPU interrupt/DMA control - may cause reset when written via proxy
-            if addr == 0xCC81:
-                return True
+            (0xCC81, 0xCC82),
             # CPU bus mode control - writing bit 0 changes bus access mode,
             # causing subsequent MMIO reads (e.g. 0xC65A) to hang the proxy CPU
-            if addr == 0xCA2E:
-                return True
-            # Check user-specified mask ranges
-            for mask_start, mask_end in proxy_mask:
-                if mask_start <= addr < mask_end:
-                    return True
-            return False
+            (0xCA2E, 0xCA2F),
+            # User-specified mask ranges
+            *proxy_mask,
+        ]
 
         # Print mask info if any
         if proxy_mask:
@@ -3180,14 +3273,14 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy
             for start, end in proxy_mask:
                 print(f"[HW]   0x{start:04X}-0x{end:04X}")
 
-        for start, end in mmio_ranges:
-            for addr in range(start, end):
-                if should_emulate(addr):
-                    memory.xdata_read_hooks[addr] = emu_read_hook
-                    memory.xdata_write_hooks[addr] = emu_write_hook
-                else:
-                    memory.xdata_read_hooks[addr] = proxy_read_hook
-                    memory.xdata_write_hooks[addr] = proxy_write_hook
+        # Proxy every MMIO range, then carve the emulated ranges back out
+        for start, end in MMIO_RANGES:
+            memory.add_xdata_range_hook(start, end, proxy_read_hook, proxy_write_hook)
+        for start, end in MMIO_RANGES:
+            for emu_start, emu_end in emulated_ranges:
+                lo, hi = max(start, emu_start), min(end, emu_end)
+                if lo < hi:
+                    memory.add_xdata_range_hook(lo, hi, emu_read_hook, emu_write_hook)
 
         # ============================================
         # SFR Proxy Hooks
@@ -3244,10 +3337,8 @@ def create_hardware_hooks(memory: 'Memory', hw: HardwareState, proxy: 'UARTProxy
         read_hook = make_read_hook(hw)
         write_hook = make_write_hook(hw)
 
-        for start, end in mmio_ranges:
-            for addr in range(start, end):
-                memory.xdata_read_hooks[addr] = read_hook
-                memory.xdata_write_hooks[addr] = write_hook
+        for start, end in MMIO_RANGES:
+            memory.add_xdata_range_hook(start, end, read_hook, write_hook)
 
     # Debug hooks for XDATA can be added here when needed
     # Example: Trace reads/writes to specific addresses
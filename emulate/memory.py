@@ -13,6 +13,30 @@ from typing import Callable, Optional, Dict
 from dataclasses import dataclass, field
 
 
+# Bit-address decode (0x00-0xFF): bits 0x00-0x7F live in IDATA 0x20-0x2F,
+# bits 0x80-0xFF in the bit-addressable SFRs (addresses ending in 0 or 8)
+BIT_BYTE_ADDR = bytes(
+    0x20 + (bit >> 3) if bit < 0x80 else bit & 0xF8 for bit in range(0x100))
+BIT_MASK = bytes(1 << (bit & 0x07) for bit in range(0x100))
+
+
+class CallbackTable(list):
+    """Per-address callback slots; None means no callback."""
+
+    def __init__(self, size: int = 0x10000):
+        super().__init__([None] * size)
+
+    def __contains__(self, addr: int) -> bool:
+        return self[addr] is not None
+
+    def get(self, addr: int, default=None):
+        cb = self[addr]
+        return default if cb is None else cb
+
+    def keys(self):
+        return [addr for addr, cb in enumerate(self) if cb is not None]
+
+
 @dataclass
 class Memory:
     """Memory subsystem for ASM2464PD emulation."""
@@ -23,30 +47,35 @@ class Memory:
     xdata: bytearray = field(default_factory=lambda: bytearray(0x10000))  # 64KB
     sfr: bytearray = field(default_factory=lambda: bytearray(128))  # 0x80-0xFF
 
-    # XDATA read/write hooks for MMIO
-    xdata_read_hooks: Dict[int, Callable[[int], int]] = field(default_factory=dict)
-    xdata_write_hooks: Dict[int, Callable[[int, int], None]] = field(default_factory=dict)
+    # XDATA read/write hooks for MMIO, one slot per address
+    xdata_read_hooks: CallbackTable = field(default_factory=CallbackTable)
+    xdata_write_hooks: CallbackTable = field(default_factory=CallbackTable)
 
     # IDATA read/write hooks (for USB state and other internal RAM emulation)
-    idata_read_hooks: Dict[int, Callable[[int], int]] = field(default_factory=dict)
-    idata_write_hooks: Dict[int, Callable[[int, int], None]] = field(default_factory=dict)
+    idata_read_hooks: CallbackTable = field(default_factory=lambda: CallbackTable(0x100))
+    idata_write_hooks: CallbackTable = field(default_factory=lambda: CallbackTable(0x100))
 
     # DMA/Timer sync flag polling counters (for RAM sync flags that need auto-clear)
     # These flags are set by firmware and should be cleared by DMA/timer completion
     sync_flag_polls: Dict[int, int] = field(default_factory=dict)
 
-    # SFR read/write hooks
-    sfr_read_hooks: Dict[int, Callable[[int], int]] = field(default_factory=dict)
-    sfr_write_hooks: Dict[int, Callable[[int, int], None]] = field(default_factory=dict)
+    # SFR read/write hooks, indexed by SFR address (0x80-0xFF)
+    sfr_read_hooks: CallbackTable = field(default_factory=lambda: CallbackTable(0x100))
+    sfr_write_hooks: CallbackTable = field(default_factory=lambda: CallbackTable(0x100))
 
     # Code bank register (DPX at 0x96)
     # Accessed via SFR but affects code reads
     SFR_DPX = 0x96
 
+    def __post_init__(self):
+        for addr in self.SYNC_FLAG_ADDRS:
+            self.xdata_read_hooks[addr] = self._sync_flag_read
+
     def load_firmware(self, data: bytes, offset: int = 0):
         """Load firmware binary into code memory."""
         end = min(offset + len(data), len(self.code))
-        self.code[offset:end] = data[:end - offset]
+        # Slice through a memoryview so the source isn't copied first
+        self.code[offset:end] = memoryview(data)[:end - offset]
 
     # Bank 1 base offset in firmware file
     # Bank 1 code starts at file offset 0xFF6B, mapped to address space 0x8000-0xFFFF
@@ -65,28 +94,41 @@ class Memory:
         """
         addr &= 0xFFFF
 
-        # If accessing upper 32KB, check bank
-        if addr >= 0x8000:
-            dpx = self.sfr[self.SFR_DPX - 0x80]
-            if dpx & 1:  # Bank 1
-                # Map 0x8000-0xFFFF to file offset 0xFF6B + offset
-                file_addr = self.BANK1_FILE_BASE + (addr - 0x8000)
-                if file_addr < len(self.code):
-                    return self.code[file_addr]
-                return 0xFF
-
-        # Bank 0 or lower 32KB
-        if addr < len(self.code):
-            return self.code[addr]
+        # Upper 32KB with DPX bit 0 set: bank 1, mapped to file offset 0xFF6B + offset
+        if addr >= 0x8000 and self.sfr[self.SFR_DPX - 0x80] & 1:
+            addr += self.BANK1_FILE_BASE - 0x8000
+
+        code = self.code
+        if addr < len(code):
+            return code[addr]
         return 0xFF
 
+    def read_code_slice(self, addr: int, n: int) -> bytes:
+        """
+        Read n consecutive CODE bytes starting at addr, with banking.
+
+        Runs that stay inside one 32KB half are sliced straight out of the
+        code buffer; anything crossing 0x8000 or wrapping past 0xFFFF falls
+        back to per-byte read_code().
+        """
+        addr &= 0xFFFF
+        end = addr + n
+        if end <= 0x8000 or (addr >= 0x8000 and end <= 0x10000):
+            base = addr
+            if addr >= 0x8000 and self.sfr[self.SFR_DPX - 0x80] & 1:
+                base = self.BANK1_FILE_BASE + (addr - 0x8000)
+            if base + n <= len(self.code):
+                return bytes(self.code[base:base + n])
+        return bytes(self.read_code(addr + i) for i in range(n))
+
     def read_idata(self, addr: int) -> int:
         """Read from IDATA (internal 256 bytes) with hooks."""
         addr &= 0xFF
 
         # Check for hooks
-        if addr in self.idata_read_hooks:
-            return self.idata_read_hooks[addr](addr)
+        hook = self.idata_read_hooks[addr]
+        if hook is not None:
+            return hook(addr)
 
         return self.idata[addr]
 
@@ -96,8 +138,9 @@ class Memory:
         value &= 0xFF
 
         # Check for hooks
-        if addr in self.idata_write_hooks:
-            self.idata_write_hooks[addr](addr, value)
+        hook = self.idata_write_hooks[addr]
+        if hook is not None:
+            hook(addr, value)
             # Still update backing store
             self.idata[addr] = value
             return
@@ -113,35 +156,40 @@ class Memory:
         """Read from XDATA with MMIO hooks."""
         addr &= 0xFFFF
 
-        # Check for MMIO hooks
-        if addr in self.xdata_read_hooks:
-            return self.xdata_read_hooks[addr](addr)
-
-        # Handle DMA/timer sync flags - auto-clear after polling
-        # This simulates hardware completing the DMA/timer operation
-        if addr in self.SYNC_FLAG_ADDRS:
-            value = self.xdata[addr]
-            if value & 0x01:  # Flag is set, count polls
-                self.sync_flag_polls[addr] = self.sync_flag_polls.get(addr, 0) + 1
-                if self.sync_flag_polls[addr] >= self.SYNC_FLAG_CLEAR_AFTER:
-                    # Simulate DMA/timer completion by clearing the flag
-                    self.xdata[addr] = 0x00
-                    self.sync_flag_polls[addr] = 0
-                    return 0x00
-            return value
-
-        # Check for range hooks (for efficiency, could use interval tree)
-        # For now, direct array access
+        # Check for MMIO hooks (single index; most addresses are unhooked RAM)
+        hook = self.xdata_read_hooks[addr]
+        if hook is not None:
+            return hook(addr)
+
         return self.xdata[addr]
 
+    def _sync_flag_read(self, addr: int) -> int:
+        """
+        Read hook for DMA/timer sync flags - auto-clear after polling.
+
+        This simulates hardware completing the DMA/timer operation.
+        Installed per address so plain RAM reads skip the check.
+        """
+        value = self.xdata[addr]
+        if value & 0x01:  # Flag is set, count polls
+            polls = self.sync_flag_polls.get(addr, 0) + 1
+            if polls >= self.SYNC_FLAG_CLEAR_AFTER:
+                # Simulate DMA/timer completion by clearing the flag
+                self.xdata[addr] = 0x00
+                self.sync_flag_polls[addr] = 0
+                return 0x00
+            self.sync_flag_polls[addr] = polls
+        return value
+
     def write_xdata(self, addr: int, value: int):
         """Write to XDATA with MMIO hooks."""
         addr &= 0xFFFF
         value &= 0xFF
 
         # Check for MMIO hooks
-        if addr in self.xdata_write_hooks:
-            self.xdata_write_hooks[addr](addr, value)
+        hook = self.xdata_write_hooks[addr]
+        if hook is not None:
+            hook(addr, value)
             return
 
         self.xdata[addr] = value
@@ -152,8 +200,9 @@ class Memory:
             raise ValueError(f"SFR address must be >= 0x80, got 0x{addr:02X}")
 
         # Check for hooks
-        if addr in self.sfr_read_hooks:
-            return self.sfr_read_hooks[addr](addr)
+        hook = self.sfr_read_hooks[addr]
+        if hook is not None:
+            return hook(addr)
 
         return self.sfr[addr - 0x80]
 
@@ -165,8 +214,9 @@ class Memory:
         value &= 0xFF
 
         # Check for hooks
-        if addr in self.sfr_write_hooks:
-            self.sfr_write_hooks[addr](addr, value)
+        hook = self.sfr_write_hooks[addr]
+        if hook is not None:
+            hook(addr, value)
             # Still update the backing store
             self.sfr[addr - 0x80] = value
             return
@@ -180,39 +230,35 @@ class Memory:
         Bit addresses 0x00-0x7F: IDATA 0x20-0x2F (bytes 0x20-0x2F, 8 bits each)
         Bit addresses 0x80-0xFF: SFR bit-addressable registers
         """
+        addr = BIT_BYTE_ADDR[bit_addr]
         if bit_addr < 0x80:
-            # IDATA bit-addressable area (0x20-0x2F)
-            byte_addr = 0x20 + (bit_addr >> 3)
-            bit_pos = bit_addr & 0x07
-            return bool(self.idata[byte_addr] & (1 << bit_pos))
-        else:
-            # SFR bit-addressable (addresses ending in 0 or 8)
-            # Bit address = SFR_addr + bit_position
-            # SFR addresses: 0x80, 0x88, 0x90, 0x98, 0xA0, 0xA8, 0xB0, 0xB8, 0xC0, 0xC8, 0xD0, 0xD8, 0xE0, 0xE8, 0xF0, 0xF8
-            sfr_addr = bit_addr & 0xF8  # Base SFR address
-            bit_pos = bit_addr & 0x07
-            return bool(self.read_sfr(sfr_addr) & (1 << bit_pos))
+            return bool(self.idata[addr] & BIT_MASK[bit_addr])
+        # SFR addresses: 0x80, 0x88, 0x90, 0x98, 0xA0, 0xA8, 0xB0, 0xB8, 0xC0, 0xC8, 0xD0, 0xD8, 0xE0, 0xE8, 0xF0, 0xF8
+        hook = self.sfr_read_hooks[addr]
+        if hook is not None:
+            return bool(hook(addr) & BIT_MASK[bit_addr])
+        return bool(self.sfr[addr - 0x80] & BIT_MASK[bit_addr])
 
     def write_bit(self, bit_addr: int, value: bool):
         """Write to bit-addressable memory."""
+        addr = BIT_BYTE_ADDR[bit_addr]
+        mask = BIT_MASK[bit_addr]
         if bit_addr < 0x80:
             # IDATA bit-addressable area
-            byte_addr = 0x20 + (bit_addr >> 3)
-            bit_pos = bit_addr & 0x07
             if value:
-                self.idata[byte_addr] |= (1 << bit_pos)
+                self.idata[addr] |= mask
             else:
-                self.idata[byte_addr] &= ~(1 << bit_pos)
+                self.idata[addr] &= ~mask
+            return
+
+        # SFR bit-addressable: read-modify-write, through hooks only if present
+        if self.sfr_read_hooks[addr] is not None or self.sfr_write_hooks[addr] is not None:
+            val = self.read_sfr(addr)
+            self.write_sfr(addr, (val | mask) if value else (val & ~mask))
+        elif value:
+            self.sfr[addr - 0x80] |= mask
         else:
-            # SFR bit-addressable
-            sfr_addr = bit_addr & 0xF8
-            bit_pos = bit_addr & 0x07
-            val = self.read_sfr(sfr_addr)
-            if value:
-                val |= (1 << bit_pos)
-            else:
-                val &= ~(1 << bit_pos)
-            self.write_sfr(sfr_addr, val)
+            self.sfr[addr - 0x80] &= ~mask
 
     def add_xdata_hook(self, addr: int, read_fn: Optional[Callable] = None,
                        write_fn: Optional[Callable] = None):
@@ -225,12 +271,11 @@ class Memory:
     def add_xdata_range_hook(self, start: int, end: int,
                              read_fn: Optional[Callable] = None,
                              write_fn: Optional[Callable] = None):
-        """Add read/write hooks for XDATA address range."""
-        for addr in range(start, end):
-            if read_fn:
-                self.xdata_read_hooks[addr] = read_fn
-            if write_fn:
-                self.xdata_write_hooks[addr] = write_fn
+        """Add read/write hooks for XDATA address range (end exclusive)."""
+        if read_fn:
+            self.xdata_read_hooks[start:end] = [read_fn] * (end - start)
+        if write_fn:
+            self.xdata_write_hooks[start:end] = [write_fn] * (end - start)
 
     def add_sfr_hook(self, addr: int, read_fn: Optional[Callable] = None,
                      write_fn: Optional[Callable] = None):
@@ -243,12 +288,10 @@ class Memory:
     def reset(self):
         """Reset memory to initial state."""
         # Clear IDATA
-        for i in range(len(self.idata)):
-            self.idata[i] = 0
+        self.idata[:] = bytes(len(self.idata))
 
         # Reset SFRs to defaults
-        for i in range(len(self.sfr)):
-            self.sfr[i] = 0
+        self.sfr[:] = bytes(len(self.sfr))
 
         # SP defaults to 0x07
         self.sfr[0x81 - 0x80] = 0x07
@@ -261,8 +304,7 @@ class Memory:
         # The firmware checks these values during init to determine
         # PD configuration mode. If 0x7076-0x7079 == 0xFF, it enables
         # the debug output path by setting 0x0AE5 = 0.
-        for i in range(0x7000, 0x8000):
-            self.xdata[i] = 0xFF
+        self.xdata[0x7000:0x8000] = b'\xff' * 0x1000
 
         # Pre-initialize key variables for PD debug path
         # The firmware init at 0x91D6 sets:
@@ -9,6 +9,9 @@ Protocol (binary):
   CMD_ECHO (0x00):  Send byte -> receive same byte (loopback test)
   CMD_READ (0x01):  Send addr_hi, addr_lo -> receive value
   CMD_WRITE (0x02): Send addr_hi, addr_lo, value -> receive 0x00 (ACK)
+  CMD_READ_BLOCK (0x06):  Send addr_hi, addr_lo, count -> receive count values
+  CMD_WRITE_BLOCK (0x07): Send addr_hi, addr_lo, count, values -> receive 0x00 (ACK)
+  CMD_ECHO_BLOCK (0x08):  Send count, values -> receive the same values
 
 Usage:
     from uart_proxy import UARTProxy
@@ -18,7 +21,9 @@ Usage:
         proxy.write(0x9000, 0xFF)
 """
 
+import struct
 import time
+from collections import deque
 from typing import Optional
 
 from pyftdi.ftdi import Ftdi
@@ -30,6 +35,26 @@ CMD_WRITE = 0x02
 CMD_SFR_READ = 0x03
 CMD_SFR_WRITE = 0x04
 CMD_INT_ACK = 0x05  # Emulator finished ISR (RETI)
+CMD_READ_BLOCK = 0x06
+CMD_WRITE_BLOCK = 0x07
+CMD_ECHO_BLOCK = 0x08
+
+# Command packet layouts (addresses are big-endian)
+_PKT_CMD_BYTE = struct.Struct('BB')            # cmd, value/addr8
+_PKT_CMD_BYTE_BYTE = struct.Struct('BBB')      # cmd, addr8, value
+_PKT_CMD_ADDR = struct.Struct('>BH')           # cmd, addr16
+_PKT_CMD_ADDR_BYTE = struct.Struct('>BHB')     # cmd, addr16, value/count
+
+# Most bytes one block command can move (count is a single byte)
+MAX_BLOCK = 255
+
+# The proxy UART has no flow control. Its RX FIFO depth is undocumented;
+# assume it matches the documented 16-byte TX FIFO. Every packet the host
+# sends must fit in it, so the proxy can never be overrun however slowly
+# its loop drains bytes. Responses are not limited (the FTDI side buffers).
+UART_RX_FIFO = 16
+MAX_WRITE_BLOCK = UART_RX_FIFO - _PKT_CMD_ADDR_BYTE.size
+MAX_ECHO_BLOCK = UART_RX_FIFO - _PKT_CMD_BYTE.size
 
 # Interrupt signal - 0x7E followed by int_mask (0x00-0x3F)
 # This can never be confused with a valid response since ~0x7E = 0x81,
@@ -46,6 +71,10 @@ INT_NAMES = {
     5: 'Timer2',
 }
 
+# Interrupt signal mask (0x00-0x3F) -> interrupt numbers / names, lowest first
+MASK_TO_INTS = tuple(tuple(i for i in range(6) if mask & (1 << i)) for mask in range(0x40))
+MASK_TO_NAMES = tuple(', '.join(INT_NAMES[i] for i in ints) for ints in MASK_TO_INTS)
+
 
 class InterruptPending(Exception):
     """
@@ -66,6 +95,9 @@ class InterruptPending(Exception):
 class UARTProxy:
     """Proxy MMIO access to real ASM2464PD hardware over UART."""
 
+    # Empty USB reads per read_data_bytes() call (~1ms each with latency timer 1)
+    READ_ATTEMPTS = 10
+
     def __init__(self, device_url: str = 'ftdi://ftdi:230x/1', timeout: float = 1.0):
         """
         Initialize UART proxy connection.
@@ -87,7 +119,7 @@ class UARTProxy:
         self.debug = 0
 
         # Pending interrupts from hardware (queue of interrupt numbers)
-        self.pending_interrupts = []
+        self.pending_interrupts = deque()
 
         # Interrupt statistics
         self.interrupt_count = 0
@@ -124,7 +156,7 @@ class UARTProxy:
         self.ftdi.purge_buffers()
 
         # Clear any pending interrupts from before reset
-        self.pending_interrupts = []
+        self.pending_interrupts.clear()
 
         # Assert reset
         self.ftdi.set_cbus_gpio(self.CBUS_RESET)
@@ -150,7 +182,7 @@ class UARTProxy:
         # detected during boot (hardware interrupts may be active)
         time.sleep(0.05)  # Let any pending data arrive
         self.ftdi.purge_buffers()
-        self.pending_interrupts = []
+        self.pending_interrupts.clear()
 
     def close(self):
         """Close FTDI connection."""
@@ -166,17 +198,20 @@ class UARTProxy:
 
     def _read_bytes(self, n: int, context: str = None) -> bytes:
         """Read exactly n bytes from UART with timeout."""
+        read_data_bytes = self.ftdi.read_data_bytes
+        attempts = self.READ_ATTEMPTS
         start = time.monotonic()
         result = bytearray()
         while len(result) < n:
-            data = self.ftdi.read_data(n - len(result))
+            # Blocks in libusb until data arrives or READ_ATTEMPTS empty USB
+            # reads (one latency-timer period each) pass, instead of sleeping
+            # and re-polling from Python
+            data = read_data_bytes(n - len(result), attempt=attempts)
             if data:
                 result.extend(data)
             elif time.monotonic() - start > self.timeout:
                 ctx = f" ({context})" if context else ""
                 raise TimeoutError(f"UART read timeout after {self.timeout}s, got {len(result)}/{n} bytes{ctx}")
-            else:
-                time.sleep(0.00001)  # 10us poll interval
         return bytes(result)
 
     def _read_response(self, context: str = None) -> int:
@@ -208,14 +243,12 @@ class UARTProxy:
                 int_mask = byte1
 
                 # Queue each interrupt that's set in the bitmask
-                for i in range(6):
-                    if int_mask & (1 << i):
-                        self.pending_interrupts.append(i)
-                        self.interrupt_count += 1
+                ints = MASK_TO_INTS[int_mask]
+                self.pending_interrupts.extend(ints)
+                self.interrupt_count += len(ints)
 
                 if self.debug >= 1:
-                    int_names = [INT_NAMES.get(i, f'?{i}') for i in range(6) if int_mask & (1 << i)]
-                    print(f"[PROXY] >>> INTERRUPT mask=0x{int_mask:02X} ({', '.join(int_names)})")
+                    print(f"[PROXY] >>> INTERRUPT mask=0x{int_mask:02X} ({MASK_TO_NAMES[int_mask]})")
 
                 # Continue to read actual response
                 continue
@@ -241,7 +274,7 @@ class UARTProxy:
             Interrupt number or None if no interrupts pending
         """
         if self.pending_interrupts:
-            return self.pending_interrupts.pop(0)
+            return self.pending_interrupts.popleft()
         return None
 
     def ack_interrupt(self, int_mask: int):
@@ -254,7 +287,7 @@ class UARTProxy:
         Args:
             int_mask: Bitmask of interrupts being acknowledged (same as received)
         """
-        self._write_bytes(bytes([CMD_INT_ACK, int_mask]))
+        self._write_bytes(_PKT_CMD_BYTE.pack(CMD_INT_ACK, int_mask))
         ack = self._read_response(f"INT_ACK mask=0x{int_mask:02X}")
         if ack != 0x00:
             raise RuntimeError(f"INT_ACK failed: expected 0x00, got 0x{ack:02X}")
@@ -274,7 +307,7 @@ class UARTProxy:
             Echoed byte value
         """
         value &= 0xFF
-        self._write_bytes(bytes([CMD_ECHO, value]))
+        self._write_bytes(_PKT_CMD_BYTE.pack(CMD_ECHO, value))
         result = self._read_response(f"ECHO 0x{value:02X}")
         self.echo_count += 1
 
@@ -283,6 +316,27 @@ class UARTProxy:
 
         return result
 
+    def echo_block(self, data: bytes) -> bytes:
+        """
+        Echo test for many bytes, one round-trip per MAX_ECHO_BLOCK bytes
+        so each packet fits in the proxy's RX FIFO. Only tested against a
+        simulated proxy so far, not on real hardware.
+
+        Args:
+            data: Bytes to echo
+
+        Returns:
+            Echoed bytes
+        """
+        result = bytearray()
+        for offset in range(0, len(data), MAX_ECHO_BLOCK):
+            chunk = data[offset:offset + MAX_ECHO_BLOCK]
+            self._write_bytes(_PKT_CMD_BYTE.pack(CMD_ECHO_BLOCK, len(chunk)) + bytes(chunk))
+            for i in range(len(chunk)):
+                result.append(self._read_response(f"ECHO_BLOCK byte {offset + i}"))
+            self.echo_count += len(chunk)
+        return bytes(result)
+
     def read(self, addr: int) -> int:
         """
         Read byte from XDATA address on real hardware.
@@ -295,7 +349,7 @@ class UARTProxy:
         """
         addr &= 0xFFFF
         self._last_addr = addr  # Track for debugging
-        self._write_bytes(bytes([CMD_READ, addr >> 8, addr & 0xFF]))
+        self._write_bytes(_PKT_CMD_ADDR.pack(CMD_READ, addr))
         value = self._read_response(f"READ 0x{addr:04X}")
         self.read_count += 1
         # Debug print handled by caller (hardware.py hook) which has PC context
@@ -311,7 +365,7 @@ class UARTProxy:
         """
         addr &= 0xFFFF
         value &= 0xFF
-        self._write_bytes(bytes([CMD_WRITE, addr >> 8, addr & 0xFF, value]))
+        self._write_bytes(_PKT_CMD_ADDR_BYTE.pack(CMD_WRITE, addr, value))
         ack = self._read_response(f"WRITE 0x{addr:04X}=0x{value:02X}")
         self.write_count += 1
 
@@ -330,7 +384,7 @@ class UARTProxy:
             Byte value of SFR
         """
         addr &= 0xFF
-        self._write_bytes(bytes([CMD_SFR_READ, addr]))
+        self._write_bytes(_PKT_CMD_BYTE.pack(CMD_SFR_READ, addr))
         value = self._read_response(f"SFR_READ 0x{addr:02X}")
         # Debug print handled by caller (hardware.py hook) which has PC context
         return value
@@ -345,7 +399,7 @@ class UARTProxy:
         """
         addr &= 0xFF
         value &= 0xFF
-        self._write_bytes(bytes([CMD_SFR_WRITE, addr, value]))
+        self._write_bytes(_PKT_CMD_BYTE_BYTE.pack(CMD_SFR_WRITE, addr, value))
         ack = self._read_response(f"SFR_WRITE 0x{addr:02X}=0x{value:02X}")
         if ack != 0x00:
             raise RuntimeError(f"SFR Write ACK failed: expected 0x00, got 0x{ack:02X}")
@@ -356,6 +410,10 @@ class UARTProxy:
         """
         Read multiple bytes from consecutive addresses.
 
+        Uses CMD_READ_BLOCK, one round-trip per MAX_BLOCK bytes. The
+        request is only 4 bytes; the proxy paces the replies itself.
+        Only tested against a simulated proxy so far, not on real hardware.
+
         Args:
             addr: Starting XDATA address
             size: Number of bytes to read
@@ -363,34 +421,53 @@ class UARTProxy:
         Returns:
             Bytes read
         """
-        result = bytearray(size)
-        for i in range(size):
-            result[i] = self.read(addr + i)
+        result = bytearray()
+        while size > 0:
+            count = min(size, MAX_BLOCK)
+            addr &= 0xFFFF
+            self._write_bytes(_PKT_CMD_ADDR_BYTE.pack(CMD_READ_BLOCK, addr, count))
+            for i in range(count):
+                result.append(self._read_response(f"READ_BLOCK 0x{addr + i:04X}"))
+            self.read_count += count
+            addr += count
+            size -= count
         return bytes(result)
 
     def write_block(self, addr: int, data: bytes):
         """
         Write multiple bytes to consecutive addresses.
 
+        Uses CMD_WRITE_BLOCK, one round-trip per MAX_WRITE_BLOCK bytes so
+        each packet fits in the proxy's RX FIFO. Only tested against a
+        simulated proxy so far, not on real hardware.
+
         Args:
             addr: Starting XDATA address
             data: Bytes to write
         """
-        for i, b in enumerate(data):
-            self.write(addr + i, b)
+        for offset in range(0, len(data), MAX_WRITE_BLOCK):
+            chunk = data[offset:offset + MAX_WRITE_BLOCK]
+            start = (addr + offset) & 0xFFFF
+            self._write_bytes(_PKT_CMD_ADDR_BYTE.pack(CMD_WRITE_BLOCK, start, len(chunk)) + bytes(chunk))
+            ack = self._read_response(f"WRITE_BLOCK 0x{start:04X} len={len(chunk)}")
+            self.write_count += len(chunk)
+
+            if ack != 0x00:
+                raise RuntimeError(f"Write block ACK failed: expected 0x00, got 0x{ack:02X}")
 
     def test_connection(self) -> bool:
         """
-        Test connection with echo command.
+        Test connection by echoing every byte value with echo_block.
 
         Returns:
             True if connection works
         """
         try:
-            for test_val in [0x00, 0x55, 0xAA, 0xFF]:
-                result = self.echo(test_val)
-                if result != test_val:
-                    print(f"Echo test failed: sent 0x{test_val:02X}, got 0x{result:02X}")
+            test_vector = bytes(range(256))
+            result = self.echo_block(test_vector)
+            for sent, got in zip(test_vector, result):
+                if got != sent:
+                    print(f"Echo test failed: sent 0x{sent:02X}, got 0x{got:02X}")
                     return False
             return True
         except TimeoutError:
@@ -354,8 +354,8 @@ class USBDevicePassthrough:
         if setup.bmRequestType & 0x80:  # Device-to-host
             # Debug: check DMA configuration after running firmware
             if is_get_descriptor:
-                dma_hi = hw.regs.get(0x905B, 0)
-                dma_lo = hw.regs.get(0x905C, 0)
+                dma_hi = hw.regs[0x905B]
+                dma_lo = hw.regs[0x905C]
                 dma_addr = (dma_hi << 8) | dma_lo
                 ep0_buf = bytes(hw.usb_ep0_buf[:8])
                 xdata_07e1 = self.emu.memory.xdata[0x07E1] if self.emu.memory else 0
@@ -882,13 +882,11 @@ class USBDevicePassthrough:
 
         # Write CDB to USB interface registers (0x910D-0x911C)
         # This is where firmware reads SCSI CDB from
-        for i, b in enumerate(cdb_padded):
-            hw.regs[0x910D + i] = b
+        hw.regs[0x910D:0x910D + len(cdb_padded)] = cdb_padded
 
         # Also write to EP0 buffer for firmware's alternate CDB read paths
-        for i, b in enumerate(cdb_padded):
-            hw.usb_ep_data_buf[i] = b
-            hw.usb_ep0_buf[i] = b
+        hw.usb_ep_data_buf[:len(cdb_padded)] = cdb_padded
+        hw.usb_ep0_buf[:len(cdb_padded)] = cdb_padded
         hw.usb_ep0_len = len(cdb_padded)
 
         # =====================================================
@@ -971,7 +969,7 @@ class USBDevicePassthrough:
 
         # Check if firmware indicated an error (various status locations)
         # The firmware would set status in XDATA or MMIO if there's an error
-        if hw.regs.get(0x9096, 0) & 0x80:  # Error bit
+        if hw.regs[0x9096] & 0x80:  # Error bit
             csw_status = 1
 
         return response_data, csw_status
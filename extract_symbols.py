@@ -194,16 +194,22 @@ def load_existing_ghidra_symbols(ghidra_py):
 def generate_ghidra_script(functions, registers, globals_dict, output_path):
     """Generate the complete ghidra_import_symbols.py file."""
 
-    # Split functions into bank0 and bank1
-    bank0_funcs = sorted([(addr, name) for addr, name in functions.items() if addr < 0x10000])
-    bank1_funcs = sorted([(addr, name) for addr, name in functions.items() if addr >= 0x10000])
+    # Split functions into bank0 and bank1 in one pass over the sorted list
+    bank0_funcs = []
+    bank1_funcs = []
+    for addr, name in sorted(functions.items()):
+        if addr < 0x10000:
+            bank0_funcs.append((addr, name))
+        else:
+            bank1_funcs.append((addr, name))
 
     # Filter registers (>= 0x6000) and globals (< 0x6000 or flash buffer area)
     reg_list = sorted([(addr, name) for addr, name in registers.items() if addr >= 0x6000])
     glob_list = sorted([(addr, name) for addr, name in globals_dict.items()
                         if addr < 0x6000 or (addr >= 0x7000 and addr < 0x8000)])
 
-    script = '''# Ghidra Python Script for AS2464 USB4/NVMe Firmware
+    with open(output_path, 'w') as f:
+        f.write('''# Ghidra Python Script for AS2464 USB4/NVMe Firmware
 # Imports function names, register labels, and global variables from reverse engineering work
 #
 # To use: Run in Ghidra's Script Manager on the loaded fw.bin
@@ -276,13 +282,13 @@ def add_bank0_functions():
     # Bank 0 Function mappings: (address, name)
     # These are verified addresses from our C reimplementation
     functions = [
-'''
+''')
 
-    # Add bank0 functions
-    for addr, name in bank0_funcs:
-        script += f'        (0x{addr:04x}, "{name}"),\n'
+        # Add bank0 functions
+        f.writelines(f'        (0x{addr:04x}, "{name}"),\n'
+                     for addr, name in bank0_funcs)
 
-    script += '''    ]
+        f.write('''    ]
 
     count = 0
     for addr_int, name in functions:
@@ -312,13 +318,13 @@ def add_bank1_functions():
     #   - Use file offset directly (0xFF6B+) OR
     #   - Use CPU addr + CODE_BANK1 overlay
     functions = [
-'''
+''')
 
-    # Add bank1 functions
-    for addr, name in bank1_funcs:
-        script += f'        (0x{addr:05x}, "{name}"),\n'
+        # Add bank1 functions
+        f.writelines(f'        (0x{addr:05x}, "{name}"),\n'
+                     for addr, name in bank1_funcs)
 
-    script += '''    ]
+        f.write('''    ]
 
     count = 0
     for file_offset, name in functions:
@@ -346,13 +352,13 @@ def add_registers():
     # Register mappings: (address, name)
     # These are hardware registers (>= 0x6000)
     registers = [
-'''
+''')
 
-    # Add registers
-    for addr, name in reg_list:
-        script += f'        (0x{addr:04X}, "{name}"),\n'
+        # Add registers
+        f.writelines(f'        (0x{addr:04X}, "{name}"),\n'
+                     for addr, name in reg_list)
 
-    script += '''    ]
+        f.write('''    ]
 
     count = 0
     for addr_int, name in registers:
@@ -378,13 +384,13 @@ def add_globals():
     # Global variable mappings: (address, name)
     # These are RAM locations (< 0x6000)
     globals_list = [
-'''
+''')
 
-    # Add globals
-    for addr, name in glob_list:
-        script += f'        (0x{addr:04X}, "{name}"),\n'
+        # Add globals
+        f.writelines(f'        (0x{addr:04X}, "{name}"),\n'
+                     for addr, name in glob_list)
 
-    script += '''    ]
+        f.write('''    ]
 
     count = 0
     for addr_int, name in globals_list:
@@ -442,10 +448,7 @@ def run():
 
 # Run the script
 run()
-'''
-
-    with open(output_path, 'w') as f:
-        f.write(script)
+''')
 
     print(f"Generated {output_path}")
     print(f"  Bank 0 functions: {len(bank0_funcs)}")
@@ -0,0 +1,63 @@
+#!/bin/bash
+#
+# Build a PGO + LTO CPython trained on the ASM2464PD emulator
+#
+# The emulator spends nearly all of its time in the CPython eval loop, so a
+# profile-guided build trained on the emulator's own opcode mix lays out the
+# interpreter's hot paths for this workload rather than the stock test suite.
+#
+# Usage:
+#   scripts/build_pgo_python.sh <cpython-src-dir> [install-prefix]
+#
+#   cpython-src-dir  A CPython source checkout/tarball (3.10+)
+#   install-prefix   Where to install (default: $HOME/.local/python-pgo-emu)
+#
+# Then run the emulator with:
+#   $PREFIX/bin/python3 emulate/emu.py fw.bin
+#
+# Environment:
+#   PGO_CYCLES  Cycles to run for the training workload (default: 1000000)
+#   JOBS        Parallel make jobs (default: nproc)
+#
+
+set -e
+
+if [ -z "$1" ]; then
+    echo "Usage: $0 <cpython-src-dir> [install-prefix]"
+    exit 1
+fi
+
+PROJECT_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+CPYTHON_SRC="$(cd "$1" && pwd)"
+PREFIX="${2:-$HOME/.local/python-pgo-emu}"
+PGO_CYCLES="${PGO_CYCLES:-1000000}"
+JOBS="${JOBS:-$(nproc)}"
+
+if [ ! -f "$CPYTHON_SRC/configure" ]; then
+    echo "Error: $CPYTHON_SRC does not look like a CPython source tree"
+    exit 1
+fi
+
+if [ ! -f "$PROJECT_ROOT/fw.bin" ]; then
+    echo "Error: $PROJECT_ROOT/fw.bin not found (needed for the training run)"
+    exit 1
+fi
+
+# PROFILE_TASK runs with the instrumented ./python from the build directory.
+# The emulator's own UART/HW output is discarded; only the profile matters.
+PROFILE_TASK="$PROJECT_ROOT/emulate/emu.py $PROJECT_ROOT/fw.bin --max-cycles $PGO_CYCLES --no-uart-log > /dev/null"
+
+echo "=== Building PGO CPython ==="
+echo "Source:   $CPYTHON_SRC"
+echo "Prefix:   $PREFIX"
+echo "Training: emu.py fw.bin --max-cycles $PGO_CYCLES"
+echo ""
+
+cd "$CPYTHON_SRC"
+./configure --prefix="$PREFIX" --enable-optimizations --with-lto
+make -j"$JOBS" PROFILE_TASK="$PROFILE_TASK"
+make install
+
+echo ""
+echo "=== Done ==="
+echo "Run the emulator with: $PREFIX/bin/python3 emulate/emu.py fw.bin"
@@ -7,8 +7,12 @@ Parses .h and .c files for address comments and checks them against the firmware
 
 import os
 import re
+import select
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Paths
@@ -21,21 +25,116 @@ SRC_DIR = PROJECT_ROOT / "src"
 BANK1_FILE_BASE = 0xFF6B
 BANK1_CODE_BASE = 0x8000
 
+# ANSI color escape sequences in r2 output
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Lines that describe memory mappings or regions rather than functions
+SKIP_RE = re.compile('|'.join([
+    r'Physical\s+0x',           # Memory mapping descriptions
+    r'→\s*Logical',             # Arrow mappings
+    r':\s*Bank\s+[01]\s+dispatch',  # Dispatch region descriptions
+    r'dispatch\s+stubs',        # Dispatch stub descriptions
+    r'BANK\s+MAPPING',          # Bank mapping header
+    r'mapped\s+at\s+0x',        # "mapped at" descriptions
+    r'Dispatch\s+Functions\s*\(',  # "Bank 1 Dispatch Functions (" section headers
+    r'dispatches\s+to\s+bank',  # "dispatches to bank 1" descriptions
+    r'->\s*dispatches',         # "-> dispatches" comments
+]), re.IGNORECASE)
+
+# Address ranges like 0xABCD-0xEFGH
+ADDR_RANGE_RE = re.compile(r'0x([0-9a-fA-F]{4,5})\s*-\s*0x([0-9a-fA-F]{4,5})')
+# Function declaration followed by a comment: "void func(void);  /* ..."
+FUNC_DECL_RE = re.compile(r'(\w+)\s*\([^)]*\)\s*;?\s*/\*')
+# Function name in a comment header: " * func_name - description"
+HEADER_NAME_RE = re.compile(r'\*\s+(\w+)\s+-')
+
 def calc_file_offset(code_addr, is_bank1):
     """Calculate file offset from code address."""
     if is_bank1:
         return BANK1_FILE_BASE + (code_addr - BANK1_CODE_BASE)
     return code_addr
 
+# Seconds to wait for each r2 reply (same limit the one-shot r2 runs had)
+R2_TIMEOUT = 5
+
+# Long-lived r2 process per worker thread, reused for every disassembly
+# (started on first use). Every live session is also kept in _r2_procs so
+# main() can shut them down when verification is done.
+_r2_local = threading.local()
+_r2_procs = []
+_r2_procs_lock = threading.Lock()
+
+def _r2_read_reply(proc):
+    """Read one r2 -0 reply: everything up to the NUL terminator."""
+    fd = proc.stdout.fileno()
+    deadline = time.monotonic() + R2_TIMEOUT
+    buf = bytearray()
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise TimeoutError(f"r2 did not reply within {R2_TIMEOUT}s")
+        # r2 sends nothing past the NUL until the next command, so reading
+        # in chunks cannot swallow part of a later reply
+        chunk = os.read(fd, 4096)
+        end = chunk.find(b'\x00')
+        if end >= 0:
+            buf += chunk[:end]
+        else:
+            buf += chunk
+        if not chunk or end >= 0:
+            return buf.decode(errors='replace')
+
+def _r2_close(proc):
+    """Kill an r2 session and reap it."""
+    with _r2_procs_lock:
+        if proc in _r2_procs:
+            _r2_procs.remove(proc)
+    proc.kill()
+    proc.wait()
+    proc.stdout.close()
+    try:
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
+
+def _r2_close_all():
+    """Close every r2 session started by any thread."""
+    with _r2_procs_lock:
+        procs = list(_r2_procs)
+    for proc in procs:
+        _r2_close(proc)
+
+def _r2_session():
+    """Return this thread's r2 process, starting it if needed."""
+    proc = getattr(_r2_local, 'proc', None)
+    if proc is None or proc.poll() is not None:
+        if proc is not None:
+            _r2_close(proc)
+        # -0 makes r2 terminate the banner and each command's output with NUL
+        proc = subprocess.Popen(
+            ['r2', '-a', '8051', '-q0', str(FW_BIN)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        with _r2_procs_lock:
+            _r2_procs.append(proc)
+        _r2_local.proc = proc
+        _r2_read_reply(proc)
+    return proc
+
 def disassemble_at(file_offset, num_instructions=5):
     """Disassemble at a file offset using r2."""
     try:
-        cmd = f"r2 -a 8051 -q -c 'pd {num_instructions} @ 0x{file_offset:x}' {FW_BIN}"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5)
+        r2 = _r2_session()
+        r2.stdin.write(f"pd {num_instructions} @ 0x{file_offset:x}\n".encode())
+        r2.stdin.flush()
         # Strip ANSI color codes
-        output = re.sub(r'\x1b\[[0-9;]*m', '', result.stdout)
+        output = ANSI_ESCAPE_RE.sub('', _r2_read_reply(r2))
         return output.strip()
     except Exception as e:
+        # The session may be hung or out of step; start a fresh one next time
+        proc = getattr(_r2_local, 'proc', None)
+        if proc is not None:
+            _r2_local.proc = None
+            _r2_close(proc)
         return f"ERROR: {e}"
 
 def get_bytes_at(file_offset, count=8):
@@ -53,21 +152,8 @@ def parse_address_comment(line, prev_lines=None):
     Parse address from comment line.
     Returns (start_addr, end_addr, is_bank1, func_name) or None
     """
-    # Skip lines that describe memory mappings or regions rather than functions
-    skip_patterns = [
-        r'Physical\s+0x',           # Memory mapping descriptions
-        r'→\s*Logical',             # Arrow mappings
-        r':\s*Bank\s+[01]\s+dispatch',  # Dispatch region descriptions
-        r'dispatch\s+stubs',        # Dispatch stub descriptions
-        r'BANK\s+MAPPING',          # Bank mapping header
-        r'mapped\s+at\s+0x',        # "mapped at" descriptions
-        r'Dispatch\s+Functions\s*\(',  # "Bank 1 Dispatch Functions (" section headers
-        r'dispatches\s+to\s+bank',  # "dispatches to bank 1" descriptions
-        r'->\s*dispatches',         # "-> dispatches" comments
-    ]
-    for pattern in skip_patterns:
-        if re.search(pattern, line, re.IGNORECASE):
-            return None
+    if SKIP_RE.search(line):
+        return None
 
     # Patterns to match:
     # /* 0x1234-0x5678 */
@@ -75,10 +161,10 @@ def parse_address_comment(line, prev_lines=None):
     # /* Bank 1 Address: 0x1234-0x5678 */
     # void func(void);  /* 0x1234-0x5678 */
 
-    is_bank1 = 'bank 1' in line.lower() or 'bank1' in line.lower()
+    lower = line.lower()
+    is_bank1 = 'bank 1' in lower or 'bank1' in lower
 
-    # Match address ranges like 0xABCD-0xEFGH
-    range_match = re.search(r'0x([0-9a-fA-F]{4,5})\s*-\s*0x([0-9a-fA-F]{4,5})', line)
+    range_match = ADDR_RANGE_RE.search(line)
     if range_match:
         start = int(range_match.group(1), 16)
         end = int(range_match.group(2), 16)
@@ -90,13 +176,13 @@ def parse_address_comment(line, prev_lines=None):
         # Try to extract function name
         func_name = None
         # Check for function declaration pattern
-        func_match = re.search(r'(\w+)\s*\([^)]*\)\s*;?\s*/\*', line)
+        func_match = FUNC_DECL_RE.search(line)
         if func_match:
             func_name = func_match.group(1)
         # Check previous lines for function name in comment header
         if not func_name and prev_lines:
             for prev in prev_lines[-5:]:
-                name_match = re.search(r'\*\s+(\w+)\s+-', prev)
+                name_match = HEADER_NAME_RE.search(prev)
                 if name_match:
                     func_name = name_match.group(1)
                     break
@@ -118,7 +204,9 @@ def scan_file(filepath):
 
     prev_lines = []
     for lineno, line in enumerate(lines, 1):
-        result = parse_address_comment(line, prev_lines)
+        # Every address comment has a 0x literal; skip the regex work for
+        # the vast majority of lines that don't
+        result = parse_address_comment(line, prev_lines) if '0x' in line else None
         if result:
             start, end, is_bank1, func_name = result
             findings.append({
@@ -215,9 +303,17 @@ def main():
     summary_mode = '--summary' in sys.argv
     show_all = '--all' in sys.argv
 
-    for finding in sorted(all_findings, key=lambda x: (str(x['file']), x['line'])):
+    # Verification is dominated by r2 round-trips, so run it across a pool
+    # of threads (each with its own r2 session) and report in source order
+    all_findings.sort(key=lambda x: (str(x['file']), x['line']))
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            verifications = list(pool.map(verify_address, all_findings))
+    finally:
+        _r2_close_all()
+
+    for finding, verification in zip(all_findings, verifications):
         rel_path = finding['file'].relative_to(PROJECT_ROOT)
-        verification = verify_address(finding)
 
         has_issues = len(verification['issues']) > 0
         if has_issues:
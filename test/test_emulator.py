@@ -186,6 +186,23 @@ class TestEmulatorExecution:
 
         assert result == 0x50, f"Expected SP=0x50, got 0x{result:02X}"
 
+    def test_alu_flags(self, emulator):
+        """Test ADD/SUBB set A and the PSW flags through the SFR backing store."""
+        emu = emulator
+
+        # MOV A,#7F ; ADD A,#01 ; SUBB A,#81
+        program = bytes([0x74, 0x7F, 0x24, 0x01, 0x94, 0x81])
+        emu.memory.code[0:len(program)] = program
+
+        emu.step()
+        emu.step()
+        assert emu.cpu.A == 0x80
+        assert (emu.cpu.CY, emu.cpu.AC, emu.cpu.OV) == (False, True, True)
+
+        emu.step()
+        assert emu.cpu.A == 0xFF
+        assert (emu.cpu.CY, emu.cpu.AC, emu.cpu.OV) == (True, True, False)
+
     def test_firmware_load(self, firmware_path, firmware_name):
         """Test that firmware loads correctly."""
         if firmware_path is None:
@@ -2091,9 +2108,9 @@ class TestUSBDescriptorInit:
 
         # Also search MMIO regs
         found_in_regs = []
-        for addr in emu.hw.regs:
-            if emu.hw.regs.get(addr, 0) == vid_low:
-                if emu.hw.regs.get(addr + 1, 0) == vid_high:
+        for addr in range(0x6000, 0xFFFF):
+            if emu.hw.regs[addr] == vid_low:
+                if emu.hw.regs[addr + 1] == vid_high:
                     found_in_regs.append(addr)
 
         if found_in_regs:
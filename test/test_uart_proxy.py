@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test the UART proxy host protocol against a fake FTDI device.
+
+The fake records every packet the host writes and plays back scripted
+proxy replies, so these tests check the exact command framing without
+real hardware.
+
+Usage:
+    pytest test/test_uart_proxy.py -v
+"""
+
+import sys
+import types
+from pathlib import Path
+import pytest
+
+# Add emulate directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'emulate'))
+
+
+class FakeFtdi:
+    """Stands in for pyftdi's Ftdi: records writes, replays scripted replies."""
+
+    def __init__(self):
+        self.writes = []
+        self.rx = bytearray()
+
+    def write_data(self, data):
+        self.writes.append(bytes(data))
+
+    def read_data_bytes(self, size, attempt=1):
+        data = bytes(self.rx[:size])
+        del self.rx[:size]
+        return data
+
+
+def resp(*values):
+    """Proxy responses for values: <value> <~value> each."""
+    return b''.join(bytes([v, v ^ 0xFF]) for v in values)
+
+
+@pytest.fixture
+def uart_proxy(monkeypatch):
+    """The uart_proxy module, importable even without pyftdi installed."""
+    try:
+        import pyftdi.ftdi  # noqa: F401
+    except ImportError:
+        pyftdi = types.ModuleType('pyftdi')
+        pyftdi.ftdi = types.ModuleType('pyftdi.ftdi')
+        pyftdi.ftdi.Ftdi = FakeFtdi
+        monkeypatch.setitem(sys.modules, 'pyftdi', pyftdi)
+        monkeypatch.setitem(sys.modules, 'pyftdi.ftdi', pyftdi.ftdi)
+    # Import a fresh copy bound to whichever Ftdi is active, and drop it again
+    # afterwards so no other test sees a module built on the stand-in
+    previous = sys.modules.pop('uart_proxy', None)
+    import uart_proxy
+    yield uart_proxy
+    sys.modules.pop('uart_proxy', None)
+    if previous is not None:
+        sys.modules['uart_proxy'] = previous
+
+
+@pytest.fixture
+def proxy(uart_proxy, monkeypatch):
+    """UARTProxy wired to a FakeFtdi (available as proxy.ftdi)."""
+    def fake_open(self):
+        self.ftdi = FakeFtdi()
+    monkeypatch.setattr(uart_proxy.UARTProxy, '_open', fake_open)
+    return uart_proxy.UARTProxy(timeout=0.05)
+
+
+class TestEchoBlock:
+    """Test CMD_ECHO_BLOCK framing and the batched connection test."""
+
+    def test_echo_block_chunks_fit_rx_fifo(self, proxy, uart_proxy):
+        """Each echo packet (header + data) fits in the proxy RX FIFO."""
+        data = bytes(range(40))
+        proxy.ftdi.rx += resp(*data)
+
+        assert proxy.echo_block(data) == data
+        step = uart_proxy.MAX_ECHO_BLOCK
+        assert proxy.ftdi.writes == [
+            bytes([uart_proxy.CMD_ECHO_BLOCK, len(data[i:i + step])]) + data[i:i + step]
+            for i in range(0, len(data), step)
+        ]
+        assert all(len(pkt) <= uart_proxy.UART_RX_FIFO for pkt in proxy.ftdi.writes)
+        assert proxy.echo_count == len(data)
+
+    def test_connection_echoes_every_byte(self, proxy, uart_proxy):
+        """test_connection sends all 256 byte values through echo_block."""
+        proxy.ftdi.rx += resp(*range(256))
+
+        assert proxy.test_connection()
+        sent = b''.join(pkt[2:] for pkt in proxy.ftdi.writes)
+        assert sent == bytes(range(256))
+        assert {pkt[0] for pkt in proxy.ftdi.writes} == {uart_proxy.CMD_ECHO_BLOCK}
+
+    def test_connection_reports_mismatch(self, proxy):
+        """A wrong echoed byte fails the connection test."""
+        proxy.ftdi.rx += resp(*range(255), 0x00)
+
+        assert not proxy.test_connection()
+
+    def test_connection_timeout(self, proxy):
+        """A silent proxy fails the connection test instead of raising."""
+        assert not proxy.test_connection()
+
+
+class TestBlockCommands:
+    """Test CMD_READ_BLOCK / CMD_WRITE_BLOCK framing."""
+
+    def test_write_block_chunks_fit_rx_fifo(self, proxy, uart_proxy):
+        """Writes go out as MAX_WRITE_BLOCK (12-byte) chunks, one ACK each."""
+        assert uart_proxy.MAX_WRITE_BLOCK == 12
+        data = bytes(range(0x10, 0x10 + 30))
+        proxy.ftdi.rx += resp(0x00, 0x00, 0x00)
+
+        proxy.write_block(0x5000, data)
+        assert proxy.ftdi.writes == [
+            bytes([0x07, 0x50, 0x00, 12]) + data[0:12],
+            bytes([0x07, 0x50, 0x0C, 12]) + data[12:24],
+            bytes([0x07, 0x50, 0x18, 6]) + data[24:30],
+        ]
+        assert all(len(pkt) <= uart_proxy.UART_RX_FIFO for pkt in proxy.ftdi.writes)
+        assert proxy.write_count == len(data)
+
+    def test_write_block_address_wraps(self, proxy):
+        """Chunk start addresses wrap at 0xFFFF."""
+        data = bytes(20)
+        proxy.ftdi.rx += resp(0x00, 0x00)
+
+        proxy.write_block(0xFFF8, data)
+        assert [pkt[:4] for pkt in proxy.ftdi.writes] == [
+            bytes([0x07, 0xFF, 0xF8, 12]),
+            bytes([0x07, 0x00, 0x04, 8]),
+        ]
+
+    def test_write_block_bad_ack(self, proxy):
+        """A non-zero ACK raises."""
+        proxy.ftdi.rx += resp(0x01)
+
+        with pytest.raises(RuntimeError, match="Write block ACK failed"):
+            proxy.write_block(0x5000, b'\x01\x02')
+
+    def test_read_block_chunks(self, proxy):
+        """Reads ask for at most 255 bytes per CMD_READ_BLOCK."""
+        values = bytes(i & 0xFF for i in range(300))
+        proxy.ftdi.rx += resp(*values)
+
+        assert proxy.read_block(0x4000, 300) == values
+        assert proxy.ftdi.writes == [
+            bytes([0x06, 0x40, 0x00, 255]),
+            bytes([0x06, 0x40, 0xFF, 45]),
+        ]
+        assert proxy.read_count == 300
+
+    def test_read_block_address_wraps(self, proxy):
+        """The next chunk's start address wraps at 0xFFFF."""
+        proxy.ftdi.rx += resp(*bytes(260))
+
+        proxy.read_block(0xFFF0, 260)
+        assert proxy.ftdi.writes == [
+            bytes([0x06, 0xFF, 0xF0, 255]),
+            bytes([0x06, 0x00, 0xEF, 5]),
+        ]
+
+    def test_read_block_interrupt_frames(self, proxy):
+        """0x7E interrupt frames inside a block reply are queued, not data."""
+        proxy.ftdi.rx += (resp(0x11) + bytes([0x7E, 0x01]) + resp(0x7E)
+                          + bytes([0x7E, 0x22]) + resp(0x33))
+
+        assert proxy.read_block(0x9000, 3) == bytes([0x11, 0x7E, 0x33])
+        assert list(proxy.pending_interrupts) == [0, 1, 5]
+        assert proxy.interrupt_count == 3